@@ -1,9 +1,21 @@
+import sys
+
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
 
+from zomato.cache import dataset_version, load_clean
+from zomato.aggregates import FrameSummary, compute_stats
+from zomato.dataset import Dataset, expand_inputs
+from zomato.dedup import chain_table
+from zomato.engine import ENGINES, sql_aggregates
+from zomato.index import FrameIndex
+from zomato.ingest import DATA_PATH
+from zomato.lru import LRUCache
+from zomato.profiling import Profiler, section, stage
+from zomato.render import FigureRenderer, build_interactive, chart_specs, render_spec
+from zomato.schema import YES_NO, memory_report
+from zomato.snapshot import warm_snapshot
+
 # Page configuration
 st.set_page_config(page_title="Zomato Analysis", page_icon="🍴", layout="wide")
 
@@ -71,17 +83,199 @@ st.markdown("<p style='text-align: center; color: #666; font-size: 1.2rem;'>Expl
 
 st.markdown("---")
 
-# ------------------------
-# Step 1: Load dataset
-# ------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv("Zomato-data-.csv", encoding="latin-1")
-    return df
-
-df = load_data()
-
-st.markdown("""
+# With profiling on, every Step and sub-stage below records its wall time, CPU
+# time and peak memory; the markers cost nothing while it is off.
+profiler = Profiler().start() if st.sidebar.toggle("🐞 Profile this run") else None
+
+try:
+    # ------------------------
+    # Step 1: Load dataset
+    # ------------------------
+    section("Load dataset")
+    # Data sources come from the command line, e.g.
+    #   streamlit run app.py -- exports/          (one CSV per city)
+    # and default to the bundled Zomato-data-.csv.
+    sources = expand_inputs(sys.argv[1:] or [DATA_PATH])
+    multi_city = len(sources) > 1
+
+    # The dataset version (a hash of the CSV) is part of every cache key, so an
+    # updated CSV is picked up without restarting the app. load_clean() serves the
+    # cleaned frame from the columnar cache (with the dtype schema already applied)
+    # and only re-parses the CSV when its contents change. The frame is held once
+    # per process and shared read-only by every session: st.cache_data would
+    # unpickle a full copy on every hit, making each filter change O(rows).
+    @st.cache_resource(max_entries=2)
+    def load_data(path, version):
+        return load_clean(path)
+
+    # With several exports, every file is streamed in parallel into small,
+    # mergeable per-city aggregates; no session ever holds a full frame.
+    @st.cache_resource
+    def load_dataset(sources, version):
+        dataset = Dataset(list(sources))
+        dataset.aggregate()
+        return dataset
+
+    # One LRU cache shared by every session holds the statistics and the rendered
+    # figure PNGs, so repeat views only serve pre-rendered images.
+    @st.cache_resource
+    def get_cache():
+        return LRUCache()
+
+    # Figures are rendered in a pool of worker processes, shared by all sessions.
+    @st.cache_resource
+    def get_renderer():
+        return FigureRenderer()
+
+    # The unfiltered dashboard of each dataset version (statistics, summaries and
+    # every figure) is computed once into a memory-mapped snapshot that every
+    # session and server process reads from; `zomato-snapshot` can warm it before
+    # the server starts.
+    @st.cache_resource(max_entries=2)
+    def get_snapshot(path, version):
+        return warm_snapshot(path, version, render=get_renderer().render)
+
+    # Sidebar filters. Only the filters that actually narrow the data are
+    # returned, in the form FrameIndex.select() expects.
+    def sidebar_filters(stats):
+        st.sidebar.subheader("🔎 Filters")
+        filters = {}
+        types = sorted(stats.type_counts.index.astype(str))
+        chosen_types = st.sidebar.multiselect("Restaurant Type", types, default=types)
+        if len(chosen_types) < len(types):
+            filters['listed_in(type)'] = chosen_types
+        for column, label in [('online_order', "Online Order"), ('book_table', "Table Booking")]:
+            chosen = st.sidebar.multiselect(label, ['Yes', 'No'], default=['Yes', 'No'])
+            if len(chosen) < 2:
+                filters[column] = [flag for flag, text in YES_NO.items() if text in chosen]
+        cost_range = (int(stats.cost_min), int(stats.cost_max))
+        cost_band = st.sidebar.slider("Cost for Two (₹)", *cost_range, value=cost_range)
+        if cost_band != cost_range:
+            filters['approx_cost(for two people)'] = cost_band
+        rate_range = (float(stats.rate_min), float(stats.rate_max))
+        rate_band = st.sidebar.slider("Rating", *rate_range, value=rate_range, step=0.1)
+        if rate_band != rate_range:
+            filters['rate'] = rate_band
+        return filters
+
+    def show_figure(name):
+        with stage(f"display {name}"):
+            if interactive:
+                fig = snapshot.interactive(name) if snapshot else build_interactive(figure_specs[name])
+                st.plotly_chart(fig, width='stretch')
+            else:
+                if snapshot:
+                    png = snapshot.figure(name)
+                else:
+                    png = cache.get_or_compute(('figure', version, name), lambda: render_spec(figure_specs[name]))
+                st.image(png, width='stretch')
+
+    cache = get_cache()
+    if multi_city:
+        dataset_key = Dataset(sources).version()
+        with stage("load"):
+            dataset = load_dataset(tuple(sources), dataset_key)
+        city = st.sidebar.selectbox("🏙️ City", ["All cities"] + dataset.cities)
+        # Filters need the rows, which the per-city aggregates don't keep.
+        st.sidebar.caption("🔎 Filters are available when analysing a single export.")
+        version = f"{dataset_key}:{city}"
+        with stage("aggregate"):
+            aggregator = cache.get_or_compute(('aggregator', version),
+                                              lambda: dataset.aggregator(None if city == "All cities" else city))
+            stats = cache.get_or_compute(('stats', version), aggregator.stats)
+        rejected_rates = aggregator.rejected_rates
+        schema_report = None
+        snapshot = None
+    else:
+        path = sources[0]
+        version = dataset_version(path)
+        # With DuckDB installed, the CSV can be cleaned and grouped inside the
+        # engine instead; only the group table and the row summary come back.
+        engine = st.sidebar.selectbox("⚙️ Engine", ENGINES) if len(ENGINES) > 1 else 'pandas'
+        if engine == 'duckdb':
+            with stage("aggregate"):
+                aggregator = cache.get_or_compute(('aggregator', version, engine), lambda: sql_aggregates(path))
+                stats = cache.get_or_compute(('stats', version), aggregator.stats)
+            rejected_rates = aggregator.rejected_rates
+            schema_report = None
+            snapshot = None
+        else:
+            aggregator = None
+            # Unfiltered, the page is served from the snapshot without touching the rows.
+            with stage("load"):
+                snapshot = get_snapshot(path, version)
+            schema_report = snapshot.schema_report
+            rejected_rates = schema_report['rejected_rates']
+            stats = snapshot.stats
+
+        # Filters resolve through row indexes built once per dataset version,
+        # instead of re-masking the whole frame on every change (or become a
+        # WHERE clause on the DuckDB query).
+        filters = sidebar_filters(stats)
+        if filters:
+            filtered_version = f"{version}:{sorted((column, tuple(value)) for column, value in filters.items())}"
+            with stage("filter"):
+                if engine == 'duckdb':
+                    aggregator = cache.get_or_compute(('aggregator', filtered_version, engine),
+                                                      lambda: sql_aggregates(path, filters))
+                    matched = aggregator.rows
+                else:
+                    df, _ = load_data(path, version)
+                    rows = cache.get_or_compute(('index', version), lambda: FrameIndex(df)).select(filters)
+                    matched = len(rows)
+                    df = df.take(rows)
+                    # Filtered pages are aggregated from the matching rows instead.
+                    snapshot = None
+            if not matched:
+                st.warning("No restaurants match the selected filters.")
+                st.stop()
+            version = filtered_version
+            with stage("aggregate"):
+                stats = cache.get_or_compute(('stats', version),
+                                             aggregator.stats if engine == 'duckdb' else lambda: compute_stats(df))
+
+    # Plotly charts are drawn in the browser from the aggregated series, so the
+    # server sends a few KB of JSON per chart and rasterizes nothing.
+    interactive = st.sidebar.radio("📈 Charts", ["Matplotlib", "Plotly"], horizontal=True) == "Plotly"
+    figure_specs = {spec.name: spec for spec in chart_specs(stats)}
+
+    # The row-level summary (preview, missing counts, most voted restaurant) is
+    # only built when a Step that shows it is opened.
+    def get_summary():
+        if aggregator is not None:
+            return aggregator.summary
+        if snapshot is not None:
+            return snapshot.summary
+        with stage("summarize"):
+            return cache.get_or_compute(('summary', version), lambda: FrameSummary.from_frame(df))
+
+    # Restaurants resolved across repeated type listings and name spellings.
+    # Resolution needs the rows, so it is only offered when they are in memory.
+    def get_chains():
+        if aggregator is not None:
+            return None
+        if snapshot is not None:
+            return snapshot.chains
+        with stage("resolve names"):
+            return cache.get_or_compute(('chains', version), lambda: chain_table(df))
+
+    # Render a Step's Matplotlib figures that aren't cached yet concurrently,
+    # before laying the Step out.
+    def prerender(names):
+        if snapshot is not None or interactive:
+            return
+        missing_specs = [figure_specs[name] for name in names if ('figure', version, name) not in cache]
+        if missing_specs:
+            with stage("render figures"):
+                for name, png in get_renderer().render(missing_specs).items():
+                    cache.put(('figure', version, name), png)
+
+    # ------------------------
+    # Step 1: Dataset Overview
+    # ------------------------
+    def step_overview():
+        summary = get_summary()
+        st.markdown("""
 <div class='step-container'>
     <h2>📊 Step 1: Dataset Overview</h2>
     <p><b>Understanding the Data:</b> This dataset contains information about restaurants listed on Zomato, including their names, 
@@ -90,32 +284,55 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.markdown("""
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown("""
     <div class='metric-card'>
         <h4>Total Restaurants</h4>
         <p >{:,}</p>
     </div>
-    """.format(len(df)), unsafe_allow_html=True)
+    """.format(stats.total_rows), unsafe_allow_html=True)
 
-with col2:
-    st.markdown("""
+        with col2:
+            st.markdown("""
     <div class='metric-card'>
         <h4>Total Columns</h4>
         <p>{}</p>
     </div>
-    """.format(len(df.columns)), unsafe_allow_html=True)
-
-
-st.subheader("")
-st.dataframe(df.head(10), use_container_width=True)
-st.markdown("</div>", unsafe_allow_html=True)
+    """.format(len(summary.columns)), unsafe_allow_html=True)
 
-# ------------------------
-# Step 2: Data Cleaning
-# ------------------------
-st.markdown("""
+        chains = get_chains()
+        with col3:
+            if chains is not None:
+                st.markdown("""
+    <div class='metric-card'>
+        <h4>Unique Restaurants</h4>
+        <p>{:,}</p>
+    </div>
+    """.format(int(chains['outlets'].sum())), unsafe_allow_html=True)
+            else:
+                st.markdown("""
+    <div class='metric-card'>
+        <h4>Distinct Restaurants</h4>
+        <p>≈{:,}</p>
+    </div>
+    """.format(summary.names.distinct_count()), unsafe_allow_html=True)
+
+        if chains is not None:
+            repeats = stats.total_rows - int(chains['outlets'].sum())
+            st.caption(f"{repeats:,} listing(s) repeat a restaurant under another type; "
+                       f"{len(chains):,} distinct restaurant names after merging spelling variants.")
+
+        st.subheader("")
+        st.dataframe(summary.preview, width='stretch')
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # ------------------------
+    # Step 2: Data Cleaning
+    # ------------------------
+    def step_cleaning():
+        summary = get_summary()
+        st.markdown("""
 <div class='step-container'>
     <h2>🧹 Step 2: Data Cleaning and Preparation</h2>
     <p><b>Cleaning the Ratings:</b> The rating column contains values in the format "4.1/5". 
@@ -125,35 +342,34 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-def handleRate(value):
-    value = str(value).split('/')
-    value = value[0]
-    return float(value)
-
-df['rate'] = df['rate'].apply(handleRate)
-
-col1, col2 = st.columns(2)
-with col1:
-    st.subheader("✅ Cleaned Ratings Sample")
-    st.dataframe(df[['name', 'rate']].head(10), use_container_width=True)
-    
-with col2:
-    st.subheader("🔍 Missing Values Check")
-    missing_values = df.isnull().sum()
-    missing_df = pd.DataFrame({
-        'Column': missing_values.index,
-        'Missing Count': missing_values.values,
-        'Percentage': (missing_values.values / len(df) * 100).round(2)
-    })
-    st.dataframe(missing_df[missing_df['Missing Count'] > 0], use_container_width=True)
-
-st.markdown("</div>", unsafe_allow_html=True)
-
-# ------------------------
-# Step 3: Restaurant Types Analysis
-# ------------------------
-
-st.markdown("""
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("✅ Cleaned Ratings Sample")
+            st.dataframe(summary.preview[['name', 'rate']], width='stretch')
+            if rejected_rates:
+                st.caption(f"{rejected_rates:,} ratings could not be parsed (e.g. \"NEW\" or \"-\") and were set to missing.")
+        
+        with col2:
+            st.subheader("🔍 Missing Values Check")
+            missing_values = summary.missing
+            missing_df = pd.DataFrame({
+                'Column': missing_values.index,
+                'Missing Count': missing_values.values,
+                'Percentage': (missing_values.values / stats.total_rows * 100).round(2)
+            })
+            st.dataframe(missing_df[missing_df['Missing Count'] > 0], width='stretch')
+
+        if schema_report:
+            with st.expander("💾 Memory Footprint After Typing Columns"):
+                st.dataframe(memory_report(schema_report), width='stretch')
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # ------------------------
+    # Step 3: Restaurant Types Analysis
+    # ------------------------
+    def step_types():
+        st.markdown("""
 <div class='step-container'>
     <h2>🏪 Step 3: Restaurant Types Analysis</h2>
 <p><b>Categorizing Restaurants:</b> Zomato categorizes restaurants into different types like Dining, Cafes, Delivery, etc. 
@@ -161,68 +377,51 @@ Understanding the distribution of restaurant types helps us identify which categ
 This analysis reveals market saturation and opportunities in different restaurant segments.</p>
 """, unsafe_allow_html=True)
 
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("Distribution of Restaurant Types")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    type_counts = df['listed_in(type)'].value_counts()
-    colors = sns.color_palette("husl", len(type_counts))
-    ax.bar(type_counts.index, type_counts.values, color=colors)
-    plt.xticks(rotation=45, ha='right')
-    plt.xlabel('Restaurant Type', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
-    plt.title('Count of Restaurants by Type', fontsize=14, fontweight='bold', pad=20)
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close()
-    
-    st.markdown(f"""
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Distribution of Restaurant Types")
+            type_counts = stats.type_counts
+            show_figure('type_counts')
+        
+            st.markdown(f"""
         <div class='insight-box'>
             <p><b>💡 Insight:</b> The most common restaurant type is <b>{type_counts.index[0]}</b> with <b>{type_counts.values[0]:,}</b> restaurants, indicating strong demand in this category.</p>
         </div>
     """, unsafe_allow_html=True)
 
 
-with col2:
-    st.subheader("Total Votes by Restaurant Type")
-    grouped_data = df.groupby('listed_in(type)')['votes'].sum().sort_values(ascending=False)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(grouped_data.index, grouped_data.values, c='#e23744', marker='o', linewidth=3, markersize=10)
-    plt.xticks(rotation=45, ha='right')
-    plt.xlabel('Restaurant Type', fontsize=12, fontweight='bold')
-    plt.ylabel('Total Votes', fontsize=12, fontweight='bold')
-    plt.title('Customer Engagement by Restaurant Type', fontsize=14, fontweight='bold', pad=20)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close()
-    
-    st.markdown(f"""
+        with col2:
+            st.subheader("Total Votes by Restaurant Type")
+            grouped_data = stats.type_votes
+            show_figure('type_votes')
+        
+            st.markdown(f"""
         <div class='insight-box'>
             <p><b>💡 Insight:</b> <b>{grouped_data.index[0]}</b> restaurants received the most votes (<b>{grouped_data.values[0]:,}</b>), showing highest customer engagement and popularity.</p>
         </div>
         """, unsafe_allow_html=True)
 
 
-st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
-# ------------------------
-# Step 4: Most Voted Restaurant
-# ------------------------
-st.markdown("""<div class='step-container'>
+    # ------------------------
+    # Step 4: Most Voted Restaurant
+    # ------------------------
+    def step_champion():
+        summary = get_summary()
+        st.markdown("""<div class='step-container'>
              <h2>🏆 Step 4: Most Popular Restaurant</h2>
 <p><b>Finding the Champion:</b> Votes represent customer engagement and popularity. The restaurant with the maximum votes 
 indicates strong customer satisfaction and brand loyalty. This metric helps identify market leaders and successful 
 business models that others can learn from.</p>
 """, unsafe_allow_html=True)
 
-max_votes = df['votes'].max()
-restaurant_with_max_votes = df.loc[df['votes'] == max_votes]
+        max_votes = summary.champion['votes']
 
-col1, col2, col3 = st.columns([1, 2, 1])
-with col2:
-    st.markdown(f"""
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.markdown(f"""
 <div style='
     background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
     padding: 1.5rem 2rem;
@@ -231,243 +430,200 @@ with col2:
     color: white;
     margin-bottom: 1rem;
 '>
-    <h2 style='color: white; margin: 0;'>&#x1F947; {restaurant_with_max_votes['name'].values[0]}</h2>
+    <h2 style='color: white; margin: 0;'>&#x1F947; {summary.champion['name']}</h2>
     <h1 style='color: white; margin: 0.2rem 0;'>{max_votes:,} Votes</h1>
-    <p style='font-size: 1.1rem; margin: 0;'>&#x2B50; Rating: {restaurant_with_max_votes['rate'].values[0]}/5</p>
+    <p style='font-size: 1.1rem; margin: 0;'>&#x2B50; Rating: {summary.champion['rate']}/5</p>
 </div>
 """, unsafe_allow_html=True)
 
-st.markdown("</div>", unsafe_allow_html=True)
-
-# ------------------------
-# Step 5: Online Order Analysis
-# ------------------------
-
-st.markdown("""<div class='step-container'>
+        top_voted = summary.top_voted
+        tied = int((top_voted['votes'] == max_votes).sum())
+        if tied > 1:
+            st.caption(f"{tied - 1} more restaurant(s) tied with {max_votes:,} votes.")
+        with st.expander(f"🏅 Top {summary.TOP_VOTED} Restaurants by Votes"):
+            st.dataframe(top_voted.reset_index(drop=True).rename(columns=str.title),
+                         width='stretch', hide_index=True)
+        chains = get_chains()
+        if chains is not None:
+            with st.expander("🔗 Top Chains by Votes (each outlet counted once)"):
+                st.dataframe(chains.head(10).rename(columns=str.title), width='stretch', hide_index=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # ------------------------
+    # Step 5: Online Order Analysis
+    # ------------------------
+    def step_online():
+        st.markdown("""<div class='step-container'>
              <h2>🛵 Step 5: Online Order Availability</h2>
 <p><b>Digital Presence:</b> In today's digital age, online ordering capability is crucial for restaurant success. 
 This analysis shows how many restaurants offer online ordering versus those that don't. It reflects the digital 
 transformation in the food industry and customer convenience preferences.</p>
 """, unsafe_allow_html=True)
 
-col1, col2 = st.columns([1, 1])
-
-with col1:
-    fig, ax = plt.subplots(figsize=(8, 6))
-    online_counts = df['online_order'].value_counts()
-    colors = ['#4CAF50', '#FF5252']
-    wedges, texts, autotexts = ax.pie(online_counts.values, labels=online_counts.index, autopct='%1.1f%%', 
-                                        colors=colors, startangle=90, textprops={'fontsize': 12, 'fontweight': 'bold'})
-    ax.set_title('Online Order Availability', fontsize=14, fontweight='bold', pad=20)
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close()
-
-with col2:
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.countplot(x=df['online_order'], palette=['#4CAF50', '#FF5252'], ax=ax)
-    ax.set_xlabel('Online Order Available', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
-    ax.set_title('Restaurant Count by Online Order Availability', fontsize=14, fontweight='bold', pad=20)
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close()
-
-online_pct = (online_counts['Yes'] / online_counts.sum() * 100).round(1)
-
-st.markdown(f"""
+        col1, col2 = st.columns([1, 1])
+
+        with col1:
+            online_counts = stats.online_counts
+            show_figure('online_pie')
+
+        with col2:
+            show_figure('online_counts')
+
+        online_pct = (online_counts['Yes'] / online_counts.sum() * 100).round(1)
+
+        st.markdown(f"""
 <div class='insight-box'>
     <p><b>💡 Insight:</b> <b>{online_pct}%</b> of restaurants offer online ordering, showing significant digital adoption in the food service industry.</p>
 </div>
 """, unsafe_allow_html=True)
 
 
-st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
-# ------------------------
-# Step 6: Ratings Distribution
-# ------------------------
-st.markdown("""<div class='step-container'>
+    # ------------------------
+    # Step 6: Ratings Distribution
+    # ------------------------
+    def step_ratings():
+        st.markdown("""<div class='step-container'>
             <h2>⭐ Step 6: Ratings Distribution Analysis</h2>
 <p><b>Quality Assessment:</b> Restaurant ratings reflect customer satisfaction and food quality. By analyzing the distribution 
 of ratings, we can understand overall service quality standards in the market. A normal distribution centered around 3.5-4.0 
 indicates consistent quality across most restaurants.<p>
 """, unsafe_allow_html=True)
 
-col1, col2 = st.columns([2, 1])
+        col1, col2 = st.columns([2, 1])
 
-with col1:
-    fig, ax = plt.subplots(figsize=(12, 6))
-    n, bins, patches = plt.hist(df['rate'], bins=20, color='#667eea', edgecolor='black', alpha=0.7)
-    
-    # Color gradient
-    cm = plt.cm.RdYlGn
-    for i, patch in enumerate(patches):
-        patch.set_facecolor(cm(i / len(patches)))
-    
-    plt.xlabel('Rating', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
-    plt.title('Distribution of Restaurant Ratings', fontsize=14, fontweight='bold', pad=20)
-    plt.axvline(df['rate'].mean(), color='red', linestyle='--', linewidth=2, label=f'Average: {df["rate"].mean():.2f}')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close()
-
-with col2:
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    st.metric("Average Rating", f"{df['rate'].mean():.2f} ⭐")
-    st.metric("Highest Rating", f"{df['rate'].max():.1f} ⭐")
-    st.metric("Lowest Rating", f"{df['rate'].min():.1f} ⭐")
-    st.metric("Median Rating", f"{df['rate'].median():.2f} ⭐")
-
-average_rating = df['rate'].mean()
-
-st.markdown(f"""
+        with col1:
+            show_figure('rating_histogram')
+
+        with col2:
+            st.markdown("<br><br>", unsafe_allow_html=True)
+            st.metric("Average Rating", f"{stats.rate_mean:.2f} ⭐")
+            st.metric("Highest Rating", f"{stats.rate_max:.1f} ⭐")
+            st.metric("Lowest Rating", f"{stats.rate_min:.1f} ⭐")
+            st.metric("Median Rating", f"{stats.rate_median:.2f} ⭐")
+
+        average_rating = stats.rate_mean
+
+        st.markdown(f"""
 <div class='insight-box'>
     <p><b>💡 Insight:</b> Most restaurants cluster around the <b>{average_rating:.2f}</b> rating mark, indicating consistent service quality. Very few restaurants fall below 2.5 or above 4.5.</p>
 </div>
 """, unsafe_allow_html=True)
 
 
-st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
-# ------------------------
-# Step 7: Cost Analysis
-# ------------------------
-st.markdown("""<div class='step-container'>
+    # ------------------------
+    # Step 7: Cost Analysis
+    # ------------------------
+    def step_cost():
+        st.markdown("""<div class='step-container'>
             <h2>💰 Step 7: Cost Analysis for Couples</h2>
 <p><b>Pricing Strategy:</b> Understanding the cost distribution helps identify price positioning and market segments. 
 This analysis shows the approximate cost for two people dining, revealing affordability patterns and helping customers 
 find restaurants within their budget while helping businesses position their pricing competitively.<p>
 """, unsafe_allow_html=True)
 
-fig, ax = plt.subplots(figsize=(14, 6))
-cost_counts = df['approx_cost(for two people)'].value_counts().sort_index()
-top_costs = cost_counts.nlargest(20)
-colors = plt.cm.viridis(np.linspace(0, 1, len(top_costs)))
-ax.bar(range(len(top_costs)), top_costs.values, color=colors)
-ax.set_xticks(range(len(top_costs)))
-ax.set_xticklabels(top_costs.index, rotation=45, ha='right')
-plt.xlabel('Approximate Cost for Two People', fontsize=12, fontweight='bold')
-plt.ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
-plt.title('Top 20 Most Common Price Points', fontsize=14, fontweight='bold', pad=20)
-plt.tight_layout()
-st.pyplot(fig)
-plt.close()
-
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("Average Cost", f"₹{df['approx_cost(for two people)'].mean():.0f}")
-with col2:
-    st.metric("Median Cost", f"₹{df['approx_cost(for two people)'].median():.0f}")
-with col3:
-    st.metric("Max Cost", f"₹{df['approx_cost(for two people)'].max():.0f}")
-with col4:
-    st.metric("Min Cost", f"₹{df['approx_cost(for two people)'].min():.0f}")
-
-median_cost = df['approx_cost(for two people)'].median()
-
-st.markdown(f"""
+        show_figure('cost_top20')
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Average Cost", f"₹{stats.cost_mean:.0f}")
+        with col2:
+            st.metric("Median Cost", f"₹{stats.cost_median:.0f}")
+        with col3:
+            st.metric("Max Cost", f"₹{stats.cost_max:.0f}")
+        with col4:
+            st.metric("Min Cost", f"₹{stats.cost_min:.0f}")
+
+        median_cost = stats.cost_median
+
+        st.markdown(f"""
 <div class='insight-box'>
     <p><b>💡 Insight:</b> Most restaurants are positioned in the mid-range segment with median cost around <b>₹{median_cost:.0f}</b> for two people, making dining affordable for most customers.</p>
 </div>
 """, unsafe_allow_html=True)
 
 
-st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
-# ------------------------
-# Step 8: Online vs Offline Ratings
-# ------------------------
-st.markdown("""<div class='step-container'>
+    # ------------------------
+    # Step 8: Online vs Offline Ratings
+    # ------------------------
+    def step_online_ratings():
+        st.markdown("""<div class='step-container'>
             <h2>📱 Step 8: Online vs Offline Order Ratings Comparison</h2>
 <p><b>Service Quality Comparison:</b> This boxplot compares ratings between restaurants that offer online ordering versus 
 those that don't. The visualization helps us understand if digital presence correlates with better customer satisfaction. 
 The median line inside each box shows the typical rating, while the box boundaries show the range where most ratings fall.</p>
 """, unsafe_allow_html=True)
 
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    fig, ax = plt.subplots(figsize=(10, 7))
-    bp = sns.boxplot(x='online_order', y='rate', data=df, palette=['#4CAF50', '#FF5252'], ax=ax)
-    ax.set_xlabel('Online Order Available', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Rating', fontsize=12, fontweight='bold')
-    ax.set_title('Rating Distribution: Online vs Offline Orders', fontsize=14, fontweight='bold', pad=20)
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close()
-
-with col2:
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    online_avg = df[df['online_order'] == 'Yes']['rate'].mean()
-    offline_avg = df[df['online_order'] == 'No']['rate'].mean()
-    
-    st.metric("Online Order Avg Rating", f"{online_avg:.2f} ⭐")
-    st.metric("Offline Order Avg Rating", f"{offline_avg:.2f} ⭐")
-    
-    difference = abs(online_avg - offline_avg)
-    better = "Online" if online_avg > offline_avg else "Offline"
-    st.metric("Rating Difference", f"{difference:.2f}", delta=f"{better} is better")
-if online_avg > offline_avg:
-    insight_text = f"Restaurants with online ordering have <b>{difference:.2f}</b> points higher average rating, suggesting that digital convenience positively impacts customer satisfaction."
-else:
-    insight_text = f"Restaurants without online ordering have <b>{difference:.2f}</b> points higher average rating, indicating that traditional dine-in focused establishments maintain strong quality standards."
-
-st.markdown(f"""
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            show_figure('online_rating_boxplot')
+
+        with col2:
+            st.markdown("<br><br>", unsafe_allow_html=True)
+            online_avg = stats.rate_mean_for('Yes')
+            offline_avg = stats.rate_mean_for('No')
+        
+            st.metric("Online Order Avg Rating", f"{online_avg:.2f} ⭐")
+            st.metric("Offline Order Avg Rating", f"{offline_avg:.2f} ⭐")
+        
+            difference = abs(online_avg - offline_avg)
+            better = "Online" if online_avg > offline_avg else "Offline"
+            st.metric("Rating Difference", f"{difference:.2f}", delta=f"{better} is better")
+        if online_avg > offline_avg:
+            insight_text = f"Restaurants with online ordering have <b>{difference:.2f}</b> points higher average rating, suggesting that digital convenience positively impacts customer satisfaction."
+        else:
+            insight_text = f"Restaurants without online ordering have <b>{difference:.2f}</b> points higher average rating, indicating that traditional dine-in focused establishments maintain strong quality standards."
+
+        st.markdown(f"""
 <div class='insight-box'>
     <p><b>💡 Insight:</b> {insight_text}</p>
 </div>
 """, unsafe_allow_html=True)
 
 
-st.markdown("</div>", unsafe_allow_html=True)
-
-# ------------------------
-# Step 9: Heatmap Analysis
-# ------------------------
+        st.markdown("</div>", unsafe_allow_html=True)
 
-st.markdown("""<div class='step-container'>
+    # ------------------------
+    # Step 9: Heatmap Analysis
+    # ------------------------
+    def step_heatmap():
+        st.markdown("""<div class='step-container'>
             <h2>🔥 Step 9: Restaurant Type vs Online Order Heatmap</h2>
 <p><b>Digital Adoption Patterns:</b> This heatmap reveals which types of restaurants have embraced online ordering and which 
 haven't. Darker colors indicate higher numbers. This correlation analysis helps identify which restaurant categories 
 are leading in digital transformation and which segments have opportunities for growth in online services.</p>
 """, unsafe_allow_html=True)
 
-pivot_table = df.pivot_table(index='listed_in(type)', columns='online_order', aggfunc='size', fill_value=0)
-fig, ax = plt.subplots(figsize=(10, 8))
-sns.heatmap(pivot_table, annot=True, cmap='YlOrRd', fmt='d', ax=ax, cbar_kws={'label': 'Number of Restaurants'},
-            linewidths=0.5, linecolor='gray')
-plt.title('Restaurant Type vs Online Order Availability', fontsize=14, fontweight='bold', pad=20)
-plt.xlabel('Online Order Available', fontsize=12, fontweight='bold')
-plt.ylabel('Restaurant Type', fontsize=12, fontweight='bold')
-plt.tight_layout()
-st.pyplot(fig)
-plt.close()
-
-# Calculate percentages
-pivot_pct = pivot_table.div(pivot_table.sum(axis=1), axis=0) * 100
-
-col1, col2 = st.columns(2)
-with col1:
-    st.subheader("Online Order Adoption Rate by Type")
-    adoption_df = pd.DataFrame({
-        'Restaurant Type': pivot_pct.index,
-        'Online %': pivot_pct['Yes'].round(1)
-    }).sort_values('Online %', ascending=False)
-    st.dataframe(adoption_df, use_container_width=True)
-
-with col2:
-    most_digital = pivot_pct['Yes'].idxmax()
-    most_digital_pct = pivot_pct['Yes'].max()
-    least_digital = pivot_pct['Yes'].idxmin()
-    least_digital_pct = pivot_pct['Yes'].min()
-    
-    
-st.markdown(f"""
+        pivot_table = stats.online_pivot
+        show_figure('type_online_heatmap')
+
+        # Calculate percentages
+        pivot_pct = pivot_table.div(pivot_table.sum(axis=1), axis=0) * 100
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Online Order Adoption Rate by Type")
+            adoption_df = pd.DataFrame({
+                'Restaurant Type': pivot_pct.index,
+                'Online %': pivot_pct['Yes'].round(1)
+            }).sort_values('Online %', ascending=False)
+            st.dataframe(adoption_df, width='stretch')
+
+        with col2:
+            most_digital = pivot_pct['Yes'].idxmax()
+            most_digital_pct = pivot_pct['Yes'].max()
+            least_digital = pivot_pct['Yes'].idxmin()
+            least_digital_pct = pivot_pct['Yes'].min()
+        
+        
+        st.markdown(f"""
 <div class='insight-box'>
     <p><b>💡 Key Insights:</b></p>
     <ul style='margin-top: 5px; padding-left: 1.2rem;'>
@@ -481,22 +637,23 @@ st.markdown(f"""
 
 
 
-st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
-# ------------------------
-# Final Summary
-# ------------------------
-st.markdown(f"""
+    # ------------------------
+    # Final Summary
+    # ------------------------
+    def final_summary():
+        st.markdown(f"""
 <div class='step-container'>
     <h2>📈 Summary and Key Takeaways</h2>
 </div>
 """, unsafe_allow_html=True)
 
 
-col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-with col1:
-    st.markdown("""
+        with col1:
+            st.markdown("""
     ### 🎯 Business Insights
     - The restaurant landscape is dominated by dining establishments
     - Digital adoption is strong but varies by restaurant type
@@ -504,8 +661,8 @@ with col1:
     - Mid-range pricing dominates the market
     """)
 
-with col2:
-    st.markdown("""
+        with col2:
+            st.markdown("""
     ### 💡 Recommendations
     - Restaurants should consider online ordering for better reach
     - Focus on maintaining ratings above 3.5 for competitiveness
@@ -513,7 +670,67 @@ with col2:
     - Customer engagement (votes) correlates with success
     """)
 
-st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # ------------------------
+    # Sections
+    # ------------------------
+    # Each Step is a tab, and only the open tab's code runs: switching tabs reruns
+    # the script for that Step alone. Its figures and summaries are memoized per
+    # dataset version in the shared cache, so returning to a tab is cheap.
+    SECTIONS = [
+        ("📊 Overview", step_overview, []),
+        ("🧹 Cleaning", step_cleaning, []),
+        ("🏪 Types", step_types, ['type_counts', 'type_votes']),
+        ("🏆 Most Popular", step_champion, []),
+        ("🛵 Online Orders", step_online, ['online_pie', 'online_counts']),
+        ("⭐ Ratings", step_ratings, ['rating_histogram']),
+        ("💰 Cost", step_cost, ['cost_top20']),
+        ("📱 Online vs Offline", step_online_ratings, ['online_rating_boxplot']),
+        ("🔥 Heatmap", step_heatmap, ['type_online_heatmap']),
+        ("📈 Summary", final_summary, []),
+    ]
+
+    tabs = st.tabs([label for label, _, _ in SECTIONS], key="section", on_change="rerun")
+    for tab, (label, show_section, figures) in zip(tabs, SECTIONS):
+        if tab.open:
+            section(label)
+            with tab:
+                prerender(figures)
+                show_section()
+
+    st.markdown("---")
+    st.markdown("<p style='text-align: center; color: #666;'>Made with ❤️ using Streamlit | Data Source: Zomato</p>", unsafe_allow_html=True)
+
+    # ------------------------
+    # Cache statistics
+    # ------------------------
+    with st.sidebar:
+        st.subheader("⚡ Cache")
+        cache_info = cache.info()
+        st.metric("Hit Rate", f"{cache_info['hit_rate']:.0%}")
+        st.caption(f"{cache_info['hits']:,} hits · {cache_info['misses']:,} misses · "
+                   f"{cache_info['entries']} entries · {cache_info['bytes'] / 1024 / 1024:.1f} MB")
+finally:
+    # Also when the run is cut short (st.stop(), a widget change triggering a
+    # rerun, an exception in a Step): Streamlit reruns in the same context, so a
+    # profiler left active would record every later run and keep tracemalloc on.
+    if profiler:
+        profiler.stop()
 
-st.markdown("---")
-st.markdown("<p style='text-align: center; color: #666;'>Made with ❤️ using Streamlit | Data Source: Zomato</p>", unsafe_allow_html=True)
\ No newline at end of file
+# ------------------------
+# Profile of this run
+# ------------------------
+if profiler:
+    with st.sidebar:
+        st.subheader("🐞 Profile")
+        profile = profiler.table()
+        st.dataframe(profile, width='stretch', hide_index=True)
+        total_ms = sum(record['wall'] for record in profiler.records if record['depth'] == 0) * 1000
+        st.caption(f"{total_ms:,.0f} ms in total. "
+                   "Figures rendered in worker processes count as wall time only. "
+                   "Peak memory is process-wide, so it is only exact while one session is profiled.")
+        st.download_button("Download trace (Chrome / Perfetto)", profiler.to_trace(),
+                           file_name="zomato-trace.json", mime="application/json")
+        st.download_button("Download stage log (JSON lines)", profiler.to_jsonl(),
+                           file_name="zomato-profile.jsonl", mime="application/x-ndjson")
@@ -0,0 +1,93 @@
+"""Wall time and accuracy of restaurant name resolution as the row count grows.
+
+Names are drawn from a pool of synthetic brands (random word combinations
+from the sample's names) with a long-tailed popularity, and are then
+respelled the way real exports do: branch numbers, changed case,
+punctuation, and one-character typos. Since each row's true brand is known,
+the resolved ids can be scored:
+
+* precision -- share of rows whose resolved restaurant is mostly their own brand
+* recall -- share of rows resolved together with most of their brand
+
+The time per row should stay flat as rows grow; blocking keeps the matching
+linear instead of comparing every pair of names.
+
+Usage:
+    python benchmarks/bench_dedup.py --rows 100000 1000000 5000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import load_profile  # noqa: E402
+from zomato.dedup import resolve_names  # noqa: E402
+
+
+def make_brands(count, rng):
+    words = sorted({word for name in load_profile()['names'] for word in name.split() if word.isalpha()})
+    sizes = rng.integers(2, 4, count)
+    brands = pd.Series([' '.join(rng.choice(words, size)) for size in sizes]).drop_duplicates()
+    return brands.to_numpy(dtype=object)
+
+
+def respell(names, rng, typo=0.1):
+    names = names.copy()
+    draw = rng.random(len(names))
+    upper = draw < 0.1
+    names[upper] = [name.upper() for name in names[upper]]
+    branch = (draw >= 0.1) & (draw < 0.4)
+    names[branch] = [f"{name} {number}" for name, number in zip(names[branch], rng.integers(1, 50, branch.sum()))]
+    punct = (draw >= 0.4) & (draw < 0.5)
+    names[punct] = [name.replace(' ', ' - ', 1) for name in names[punct]]
+    mistyped = rng.random(len(names)) < typo
+    positions = rng.random(mistyped.sum())
+    # Drop one character somewhere in the name.
+    names[mistyped] = [name[:int(p * len(name))] + name[int(p * len(name)) + 1:]
+                       for name, p in zip(names[mistyped], positions)]
+    return names
+
+
+def score(truth, resolved):
+    frame = pd.DataFrame({'truth': truth, 'resolved': resolved.to_numpy()})
+    pairs = frame.groupby(['resolved', 'truth']).size()
+    precision = pairs.groupby(level='resolved').max().sum() / len(frame)
+    recall = pairs.groupby(level='truth').max().sum() / len(frame)
+    return precision, recall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--brands', type=int, default=20_000)
+    parser.add_argument('--typo', type=float, default=0.1, help="share of names with a one-character typo")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    brands = make_brands(args.brands, rng)
+    popularity = 1 / np.arange(1, len(brands) + 1)
+    popularity /= popularity.sum()
+
+    print(f"{len(brands):,} brands, {args.typo:.0%} typos")
+    print(f"{'rows':>12} {'spellings':>10} {'resolved':>9} {'time (s)':>9} {'us/row':>7} "
+          f"{'precision':>10} {'recall':>7}")
+    for rows in args.rows:
+        truth = rng.choice(len(brands), size=rows, p=popularity)
+        names = respell(brands[truth], rng, args.typo)
+        start = time.perf_counter()
+        resolution = resolve_names(names)
+        elapsed = time.perf_counter() - start
+        precision, recall = score(truth, resolution.ids)
+        print(f"{rows:>12,} {pd.unique(names).size:>10,} {len(resolution.names):>9,} {elapsed:>9.2f} "
+              f"{elapsed / rows * 1e6:>7.2f} {precision:>10.1%} {recall:>7.1%}")
+
+
+if __name__ == '__main__':
+    main()
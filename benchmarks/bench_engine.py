@@ -0,0 +1,42 @@
+"""Wall time of the pandas and DuckDB backends as the row count grows, with a parity check.
+
+Synthetic CSVs (see ``synthetic.py``) include the messy values real exports
+contain: "NEW" and "-" ratings and missing fields. Both backends must
+produce identical statistics and summaries (distinct-count estimates within
+the sketch's error) before any timing is reported.
+
+Usage:
+    python benchmarks/bench_engine.py --rows 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parity import check_parity, with_duckdb, with_pandas  # noqa: E402
+from synthetic import write_csv  # noqa: E402
+from timing import best_of  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>12} {'pandas (s)':>11} {'duckdb (s)':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"zomato-{rows}.csv")
+            write_csv(path, rows, messy=0.05)
+            pandas_time, expected = best_of(lambda: with_pandas(path), args.repeat)
+            duckdb_time, actual = best_of(lambda: with_duckdb(path), args.repeat)
+            check_parity(expected, actual)
+            print(f"{rows:>12,} {pandas_time:>11.3f} {duckdb_time:>11.3f} {pandas_time / duckdb_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Per-stage timings of the dashboard pipeline on synthetic data, saved as JSON.
+
+For each row count a seeded synthetic export (see ``synthetic.py``) is
+written, then every stage is timed on its own: CSV load, rating cleanup
+(the per-row ``handleRate`` and the vectorized ``parse_rates``), the dtype
+schema, the group table and the statistics derived from it, what each Step
+computes on top of those, and each figure render. Results go to a
+JSON file; pass an earlier file as ``--baseline`` to print per-stage ratios
+and spot regressions between versions.
+
+Usage:
+    python benchmarks/bench_pipeline.py --rows 10000 1000000 --out before.json
+    python benchmarks/bench_pipeline.py --rows 10000 1000000 --out after.json --baseline before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import load_profile, write_csv  # noqa: E402
+from timing import best_of  # noqa: E402
+from zomato.aggregates import DashboardStats, FrameSummary, group_table  # noqa: E402
+from zomato.cleaning import handleRate, parse_rates  # noqa: E402
+from zomato.ingest import ENCODING  # noqa: E402
+from zomato.render import chart_specs, render_spec  # noqa: E402
+from zomato.schema import apply_schema  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def step_stages(df, stats):
+    """What each Step computes when it is shown, as ``{stage: callable}``.
+
+    Step 1 builds the row-level summary from the frame. The other Steps only
+    read :class:`DashboardStats` (lookups, weighted quantiles, the histogram
+    and box statistics), hence the ``_from_stats`` names: the aggregation they
+    share is the ``group_table`` and ``dashboard_stats`` stages.
+    """
+    def online_share():
+        counts = stats.online_counts
+        return counts.get('Yes', 0) / counts.sum()
+
+    def adoption():
+        pivot = stats.online_pivot
+        return (pivot.div(pivot.sum(axis=1), axis=0) * 100)['Yes'].idxmax()
+
+    return {
+        'step1_summary': lambda: FrameSummary.from_frame(df),
+        'step3_types_from_stats': lambda: (stats.type_counts.index[0], stats.type_votes.index[0]),
+        'step5_online_from_stats': online_share,
+        'step6_ratings_from_stats': lambda: (stats.rate_mean, stats.rate_median, stats.rate_min, stats.rate_max,
+                                  stats.rate_histogram()),
+        'step7_cost_from_stats': lambda: (stats.cost_mean, stats.cost_median, stats.cost_counts.nlargest(20)),
+        'step8_online_vs_offline_from_stats': lambda: (stats.rate_mean_for('Yes'), stats.rate_mean_for('No'),
+                                            stats.rate_box_stats()),
+        'step9_heatmap_from_stats': adoption,
+    }
+
+
+def run_size(path, rows, repeat, per_row_max, render):
+    stages = {}
+    stages['load_csv'], raw = best_of(lambda: pd.read_csv(path, encoding=ENCODING), repeat)
+    if rows <= per_row_max:
+        stages['clean_rates_handleRate'], _ = best_of(lambda: raw['rate'].apply(handleRate), 1)
+    stages['clean_rates_parse_rates'], _ = best_of(lambda: parse_rates(raw['rate']), repeat)
+    stages['apply_schema'], (df, _) = best_of(lambda: apply_schema(raw, measure_memory=False), repeat)
+    stages['group_table'], groups = best_of(lambda: group_table(df), repeat)
+    stages['dashboard_stats'], stats = best_of(lambda: DashboardStats.from_groups(groups), repeat)
+    for stage, func in step_stages(df, stats).items():
+        stages[stage], _ = best_of(func, repeat)
+    if render:
+        for spec in chart_specs(stats):
+            stages[f"render_{spec.name}"], _ = best_of(lambda: render_spec(spec), repeat)
+    return stages
+
+
+def print_results(results, baseline=None):
+    base = {entry['rows']: entry['stages'] for entry in (baseline or {}).get('results', [])}
+    for entry in results:
+        rows, stages = entry['rows'], entry['stages']
+        print(f"\n{rows:,} rows")
+        header = f"{'stage':<36} {'seconds':>10} {'rows/s':>14}"
+        print(header + (f" {'vs baseline':>12}" if rows in base else ""))
+        for stage, seconds in stages.items():
+            line = f"{stage:<36} {seconds:>10.4f} {rows / seconds if seconds else float('inf'):>14,.0f}"
+            previous = base.get(rows, {}).get(stage)
+            if previous:
+                line += f" {seconds / previous:>11.2f}x"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--per-row-max', type=int, default=1_000_000,
+                        help="skip the per-row handleRate timing above this many rows")
+    parser.add_argument('--no-render', action='store_true', help="skip the figure render stages")
+    parser.add_argument('--out', default='bench-pipeline.json')
+    parser.add_argument('--baseline', help="earlier results to compare against")
+    args = parser.parse_args(argv)
+
+    profile = load_profile()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = write_csv(os.path.join(tmp, f"zomato-{rows}.csv"), rows, args.seed, profile=profile)
+            stages = run_size(path, rows, args.repeat, args.per_row_max, not args.no_render)
+            results.append({'rows': rows, 'csv_bytes': os.path.getsize(path), 'stages': stages})
+            os.remove(path)
+
+    report = {
+        'revision': git_revision(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nresults written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
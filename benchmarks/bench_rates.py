@@ -0,0 +1,44 @@
+"""Throughput of the vectorized rating parser against the per-row handleRate.
+
+Usage:
+    python benchmarks/bench_rates.py --rows 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timing import best_of  # noqa: E402
+from zomato.cleaning import handleRate, parse_rates  # noqa: E402
+
+
+def make_rates(rows, seed=0):
+    # Clean "x.y/5" strings only -- handleRate raises on anything else.
+    rng = np.random.default_rng(seed)
+    ratings = np.round(rng.normal(3.6, 0.4, rows).clip(1.0, 5.0), 1)
+    return pd.Series(pd.Series(ratings).map('{:.1f}/5'.format), name='rate')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>12} {'handleRate':>12} {'parse_rates':>12} {'speedup':>8}")
+    for rows in args.rows:
+        rates = make_rates(rows)
+        slow, expected = best_of(lambda: rates.apply(handleRate), 1)
+        fast, (parsed, rejected) = best_of(lambda: parse_rates(rates), args.repeat)
+        assert rejected == 0
+        pd.testing.assert_series_equal(parsed, expected, check_dtype=False)
+        print(f"{rows:>12,} {rows / slow:>10,.0f}/s {rows / fast:>10,.0f}/s {slow / fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Wall time of rendering every dashboard figure with 1 vs N worker processes.
+
+Usage:
+    python benchmarks/bench_render.py --workers 1 2 4 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zomato.aggregates import compute_stats  # noqa: E402
+from zomato.cache import load_clean  # noqa: E402
+from zomato.ingest import DATA_PATH  # noqa: E402
+from zomato.render import FigureRenderer, chart_specs  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--format', default='png', choices=['png', 'svg'])
+    args = parser.parse_args(argv)
+
+    df, _ = load_clean(args.data)
+    stats = compute_stats(df)
+    specs = chart_specs(stats, fmt=args.format)
+
+    baseline = None
+    print(f"{len(specs)} figures, {len(df):,} rows")
+    print(f"{'workers':>8} {'best wall (s)':>14} {'speedup':>8}")
+    for workers in args.workers:
+        renderer = FigureRenderer(workers)
+        renderer.render(specs)  # warm-up: starts the pool and imports in the workers
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            renderer.render(specs)
+            timings.append(time.perf_counter() - start)
+        renderer.close()
+        best = min(timings)
+        baseline = baseline or best
+        print(f"{workers:>8} {best:>14.3f} {baseline / best:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Load test: dashboard sessions per second with and without the shared snapshot.
+
+Many sessions are served by a pool of worker processes, which stand in for
+Streamlit server processes. Each session fetches everything the unfiltered
+dashboard shows: the statistics, the row summary, the chain table and all
+eight figure PNGs. Three ways of serving them are compared:
+
+* rebuild -- every session parses, aggregates and renders for itself
+* process cache -- each process builds once and serves from its own memory
+  (like an in-process cache, paid once per server process)
+* snapshot -- a warm-up builds the snapshot once and every process serves
+  from the same memory-mapped file (see ``zomato/snapshot.py``)
+
+With ``--app`` each session instead runs the real ``app.py`` script
+headless (Streamlit's AppTest) against the snapshot, which adds the page
+layout cost.
+
+Usage:
+    python benchmarks/bench_sessions.py --sessions 200 --workers 4
+    python benchmarks/bench_sessions.py --rows 1000000 --sessions 100
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import SAMPLE_PATH, write_csv  # noqa: E402
+from zomato.aggregates import FrameSummary, compute_stats  # noqa: E402
+from zomato.cache import CACHE_DIR, load_clean  # noqa: E402
+from zomato.dedup import chain_table  # noqa: E402
+from zomato.render import chart_specs, render_serial  # noqa: E402
+from zomato.snapshot import SNAPSHOT_DIR, Snapshot, build_snapshot  # noqa: E402
+
+# Per-process state of the worker processes.
+_served = {}
+
+
+def _rebuild(source, cache_dir):
+    df, report = load_clean(source, cache_dir)
+    stats = compute_stats(df)
+    figures = render_serial(chart_specs(stats))
+    return stats, FrameSummary.from_frame(df), chain_table(df), figures
+
+
+def session(mode, source, cache_dir, snapshot_dir):
+    """Serve one session; return its latency in seconds."""
+    start = time.perf_counter()
+    if mode == 'rebuild':
+        _rebuild(source, cache_dir)
+    elif mode == 'process cache':
+        if 'page' not in _served:
+            _served['page'] = _rebuild(source, cache_dir)
+        stats, summary, chains, figures = _served['page']
+        [bytes(png) for png in figures.values()]
+    elif mode == 'snapshot':
+        if 'snapshot' not in _served:
+            _served['snapshot'] = Snapshot.open(source, snapshot_dir=snapshot_dir)
+        snapshot = _served['snapshot']
+        snapshot.stats, snapshot.summary, snapshot.chains
+        [snapshot.figure(spec.name) for spec in chart_specs(snapshot.stats)]
+    elif mode == 'app':
+        from streamlit.testing.v1 import AppTest
+        sys.argv = ['app.py', source]
+        # AppTest runs the script as __main__; put the worker's own back afterwards.
+        main_module = sys.modules['__main__']
+        try:
+            at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=300).run()
+        finally:
+            sys.modules['__main__'] = main_module
+        assert not at.exception, [error.value for error in at.exception]
+    return time.perf_counter() - start
+
+
+def run(mode, sessions, workers, *paths):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # Start the workers before timing, as running servers would be.
+        list(pool.map(time.sleep, [0] * workers))
+        start = time.perf_counter()
+        latencies = list(pool.map(session, [mode] * sessions, *[[path] * sessions for path in paths]))
+        elapsed = time.perf_counter() - start
+    return sessions / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--rows', type=int, default=None, help="use a synthetic export of this many rows")
+    parser.add_argument('--rebuild-sessions', type=int, default=None,
+                        help="sessions for the rebuild mode, which is slow (default: --sessions)")
+    parser.add_argument('--app', action='store_true', help="also run app.py sessions against the snapshot")
+    args = parser.parse_args(argv)
+
+    # Everything, including the caches the app keeps next to its working
+    # directory, lives in a scratch directory; worker processes inherit it.
+    cwd, tmp = os.getcwd(), tempfile.mkdtemp()
+    os.chdir(tmp)
+    try:
+        source = os.path.join(tmp, 'zomato.csv')
+        if args.rows:
+            write_csv(source, args.rows, messy=0.05)
+        else:
+            shutil.copy(SAMPLE_PATH, source)
+        cache_dir, snapshot_dir = CACHE_DIR, SNAPSHOT_DIR
+
+        start = time.perf_counter()
+        build_snapshot(source, snapshot_dir)
+        print(f"warm-up: snapshot built once in {time.perf_counter() - start:.2f}s")
+        print(f"{'mode':>14} {'sessions':>9} {'sessions/s':>11} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        modes = ['rebuild', 'process cache', 'snapshot'] + (['app'] if args.app else [])
+        for mode in modes:
+            sessions = (args.rebuild_sessions or args.sessions) if mode == 'rebuild' else args.sessions
+            rate, p50, p95 = run(mode, sessions, args.workers, source, cache_dir, snapshot_dir)
+            print(f"{mode:>14} {sessions:>9,} {rate:>11.1f} {p50 * 1000:>9.2f} {p95 * 1000:>9.2f}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Partial top-K selection against a full sort, and sketch accuracy against exact counts.
+
+The first table times the exact top 10 by votes (ties included) with
+``zomato.topk.top_k`` and with a full ``sort_values``; both must select the
+same rows. The second streams a synthetic export chunk by chunk into the
+name and price-point sketches, the way ``zomato.ingest`` does, and compares
+their distinct counts and heaviest values with exact counts computed on the
+whole column.
+
+Usage:
+    python benchmarks/bench_topk.py --rows 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import COST_COL, iter_synthetic  # noqa: E402
+from timing import best_of  # noqa: E402
+from zomato.schema import apply_schema  # noqa: E402
+from zomato.topk import ColumnSketch, top_k  # noqa: E402
+
+
+def sorted_top(votes, k):
+    ordered = votes.sort_values(ascending=False, kind='stable')
+    return ordered[ordered >= ordered.iloc[k - 1]].index.to_numpy()
+
+
+def sketch_size(sketch):
+    counters = sketch.heavy_hitters.counts
+    return sketch.distinct.registers.nbytes + counters.memory_usage(index=True, deep=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>12} {'top_k (ms)':>11} {'sort (ms)':>10} {'speedup':>8}")
+    rng = np.random.default_rng(0)
+    for rows in args.rows:
+        votes = pd.Series(np.expm1(rng.normal(4, 2, rows)).round().clip(0).astype('int64'))
+        partial_time, partial = best_of(lambda: top_k(votes.to_numpy(), args.top), args.repeat)
+        sort_time, full = best_of(lambda: sorted_top(votes, args.top), args.repeat)
+        assert np.array_equal(partial, full)
+        print(f"{rows:>12,} {partial_time * 1000:>11.2f} {sort_time * 1000:>10.2f} {sort_time / partial_time:>7.1f}x")
+
+    print()
+    print(f"{'rows':>12} {'column':>8} {'distinct':>10} {'estimate':>10} {'error':>7} {'top 20 ok':>9} {'KiB':>6}")
+    for rows in args.rows:
+        sketches = {'name': ColumnSketch(), COST_COL: ColumnSketch()}
+        exact = {column: pd.Series(dtype='int64') for column in sketches}
+        for chunk in iter_synthetic(rows, messy=0.05, chunk_rows=100_000):
+            chunk, _ = apply_schema(chunk, measure_memory=False)
+            for column, sketch in sketches.items():
+                sketch.update(chunk[column])
+                exact[column] = exact[column].add(chunk[column].value_counts(), fill_value=0)
+        for column, sketch in sketches.items():
+            counts = exact[column][exact[column] > 0]
+            estimate = sketch.distinct_count()
+            # The heaviest values must all be found; their counts may run low by at most the error bound.
+            found = sketch.top(20)
+            heaviest = counts.nlargest(20)
+            ok = heaviest.index.isin(found.index).all() and \
+                ((counts[found.index] - found) <= sketch.heavy_hitters.error).all()
+            label = 'name' if column == 'name' else 'cost'
+            print(f"{rows:>12,} {label:>8} {len(counts):>10,} {estimate:>10,} "
+                  f"{abs(estimate - len(counts)) / len(counts):>6.1%} {'yes' if ok else 'no':>9} "
+                  f"{sketch_size(sketch) / 1024:>6.0f}")
+
+
+if __name__ == '__main__':
+    main()
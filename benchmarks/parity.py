@@ -0,0 +1,54 @@
+"""Engine parity check shared by ``bench_engine.py`` and ``tests/test_engine.py``."""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zomato.aggregates import FrameSummary, compute_stats  # noqa: E402
+from zomato.engine import sql_aggregates  # noqa: E402
+from zomato.index import FrameIndex  # noqa: E402
+from zomato.ingest import ENCODING  # noqa: E402
+from zomato.schema import apply_schema  # noqa: E402
+
+
+def with_pandas(path, filters=None):
+    """Statistics, summary and rejected-rating count of ``path`` on the pandas path."""
+    df, report = apply_schema(pd.read_csv(path, encoding=ENCODING), measure_memory=False)
+    if filters:
+        df = df.take(FrameIndex(df).select(filters))
+    return compute_stats(df), FrameSummary.from_frame(df), report['rejected_rates']
+
+
+def with_duckdb(path, filters=None):
+    """The same three results from the DuckDB backend."""
+    aggregator = sql_aggregates(path, filters)
+    return aggregator.stats(), aggregator.summary, aggregator.rejected_rates
+
+
+def check_parity(expected, actual, rejected=True):
+    """Assert the :func:`with_pandas` and :func:`with_duckdb` results agree.
+
+    Filtered DuckDB results keep the rejected count of the whole parse, so
+    pass ``rejected=False`` to skip that comparison for filtered runs.
+    """
+    (stats, summary, pandas_rejected), (sql_stats, sql_summary, sql_rejected) = expected, actual
+    if rejected:
+        assert pandas_rejected == sql_rejected, (pandas_rejected, sql_rejected)
+    assert list(stats.to_dict().items()) == list(sql_stats.to_dict().items())
+    assert summary.columns == sql_summary.columns
+    pd.testing.assert_series_equal(summary.missing, sql_summary.missing)
+    pd.testing.assert_frame_equal(summary.preview.reset_index(drop=True), sql_summary.preview,
+                                  check_dtype=False, check_categorical=False)
+    champion, sql_champion = summary.champion, sql_summary.champion
+    assert (champion.get('name'), champion.get('votes')) == (sql_champion.get('name'), sql_champion.get('votes'))
+    pd.testing.assert_frame_equal(summary.top_voted.reset_index(drop=True), sql_summary.top_voted,
+                                  check_dtype=False, check_categorical=False)
+    # Distinct counts are estimates from differently hashed registers (see zomato/engine.py).
+    metrics, sql_metrics = summary.to_dict(), sql_summary.to_dict()
+    for key, sketch in (('distinct_restaurants', summary.names), ('distinct_price_points', summary.costs)):
+        estimate, sql_estimate = metrics.pop(key), sql_metrics.pop(key)
+        assert abs(estimate - sql_estimate) <= 4 * sketch.distinct.standard_error * estimate, (key, estimate, sql_estimate)
+    assert metrics == sql_metrics
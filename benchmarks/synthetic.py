@@ -0,0 +1,136 @@
+"""Seeded synthetic Zomato exports of any size.
+
+The generator learns a small profile from the bundled sample -- the share of
+each restaurant type, the online-order and table-booking rates and the cost
+distribution per type, the rating distribution per online flag and a
+log-normal fit of the votes -- and draws rows from it, so the columns,
+formats ("4.1/5" ratings, Yes/No flags) and the shape of every Step's result
+match the real file at any scale. Rows are produced in chunks, so a 100M-row
+CSV can be written without holding it in memory.
+
+Usage:
+    python benchmarks/synthetic.py 1000000 --out zomato-1m.csv
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from zomato.ingest import DATA_PATH, ENCODING  # noqa: E402
+
+TYPE_COL = 'listed_in(type)'
+COST_COL = 'approx_cost(for two people)'
+CHUNK_ROWS = 1_000_000
+SAMPLE_PATH = os.path.join(ROOT, DATA_PATH)
+
+
+def _distribution(values):
+    counts = values.value_counts()
+    return counts.index.to_numpy(), (counts / counts.sum()).to_numpy()
+
+
+def load_profile(source=SAMPLE_PATH):
+    """Per-column distributions of the sample at ``source``."""
+    df = pd.read_csv(source, encoding=ENCODING)
+    profile = {'columns': df.columns.tolist(), 'names': df['name'].unique()}
+    profile['types'] = _distribution(df[TYPE_COL])
+    profile['by_type'] = {
+        kind: {
+            'online': (group['online_order'] == 'Yes').mean(),
+            'book': (group['book_table'] == 'Yes').mean(),
+            'cost': _distribution(group[COST_COL]),
+        }
+        for kind, group in df.groupby(TYPE_COL)
+    }
+    profile['rates'] = {flag: _distribution(group['rate']) for flag, group in df.groupby('online_order')}
+    log_votes = np.log1p(df['votes'])
+    profile['votes'] = (log_votes.mean(), log_votes.std())
+    return profile
+
+
+def _format_cost(cost):
+    # Exports write thousands with a separator, e.g. "1,200".
+    return f"{cost:,}" if cost >= 1000 else str(cost)
+
+
+def _chunk(profile, rng, rows, messy):
+    types = rng.choice(profile['types'][0], size=rows, p=profile['types'][1])
+    online = np.empty(rows, dtype=bool)
+    book = np.empty(rows, dtype=bool)
+    cost = np.empty(rows, dtype=object)
+    for kind, params in profile['by_type'].items():
+        mask = types == kind
+        n = int(mask.sum())
+        online[mask] = rng.random(n) < params['online']
+        book[mask] = rng.random(n) < params['book']
+        values, p = params['cost']
+        cost[mask] = [_format_cost(int(value)) for value in rng.choice(values, size=n, p=p)]
+    rate = np.empty(rows, dtype=object)
+    for flag, (values, p) in profile['rates'].items():
+        mask = online == (flag == 'Yes')
+        rate[mask] = rng.choice(values, size=int(mask.sum()), p=p)
+    mean, std = profile['votes']
+    votes = np.expm1(rng.normal(mean, std, rows)).round().clip(0).astype('int64')
+    # Half the rows reuse a real name (chains), the rest are numbered branches.
+    names = rng.choice(profile['names'], size=rows).astype(object)
+    branch = rng.random(rows) < 0.5
+    names[branch] = [f"{name} {number}" for name, number in
+                     zip(names[branch], rng.integers(1, max(2, rows // 10), int(branch.sum())))]
+
+    frame = pd.DataFrame({
+        'name': names,
+        'online_order': np.where(online, 'Yes', 'No'),
+        'book_table': np.where(book, 'Yes', 'No'),
+        'rate': rate,
+        'votes': votes,
+        COST_COL: cost,
+        TYPE_COL: types,
+    })
+    if messy:
+        # Values real exports contain: unrated restaurants and missing fields.
+        draw = rng.random(rows)
+        frame.loc[draw < messy / 3, 'rate'] = 'NEW'
+        frame.loc[(draw >= messy / 3) & (draw < 2 * messy / 3), 'rate'] = '-'
+        frame.loc[(draw >= 2 * messy / 3) & (draw < messy), 'rate'] = None
+        frame.loc[rng.random(rows) < messy / 3, 'name'] = None
+    return frame[profile['columns']]
+
+
+def iter_synthetic(rows, seed=0, messy=0.0, profile=None, chunk_rows=CHUNK_ROWS):
+    """Yield ``rows`` synthetic rows as DataFrames of at most ``chunk_rows`` rows.
+
+    ``messy`` is the share of rows given an unparseable or missing rating.
+    """
+    profile = profile or load_profile()
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        yield _chunk(profile, rng, min(chunk_rows, rows - start), messy)
+
+
+def write_csv(path, rows, seed=0, messy=0.0, profile=None, chunk_rows=CHUNK_ROWS):
+    """Write a synthetic export of ``rows`` rows to ``path``, chunk by chunk."""
+    with open(path, 'w', encoding=ENCODING, newline='') as f:
+        for i, chunk in enumerate(iter_synthetic(rows, seed, messy, profile, chunk_rows)):
+            chunk.to_csv(f, index=False, header=i == 0)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--out', default=None, help="output CSV (default: zomato-<rows>.csv)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--messy', type=float, default=0.0, help="share of unparseable/missing ratings")
+    args = parser.parse_args(argv)
+    path = write_csv(args.out or f"zomato-{args.rows}.csv", args.rows, args.seed, args.messy)
+    print(f"wrote {args.rows:,} rows to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""Timing helper shared by the benchmark scripts."""
+
+import time
+
+
+def best_of(func, repeat):
+    """Fastest of ``repeat`` calls of ``func`` in seconds, and the result of the last call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
@@ -0,0 +1,30 @@
+"""Shared fixtures: the bundled sample and a small messy synthetic export."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from synthetic import COST_COL, SAMPLE_PATH, iter_synthetic  # noqa: E402
+from zomato.ingest import ENCODING  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def messy_path(tmp_path_factory):
+    """A 3,000-row export with unparseable ratings, missing names and gaps in votes and costs."""
+    frame = next(iter_synthetic(3000, seed=1, messy=0.05))
+    rng = np.random.default_rng(1)
+    frame.loc[rng.random(len(frame)) < 0.01, 'votes'] = None
+    frame.loc[rng.random(len(frame)) < 0.01, COST_COL] = None
+    path = tmp_path_factory.mktemp('data') / 'zomato-messy.csv'
+    frame.to_csv(path, index=False, encoding=ENCODING)
+    return str(path)
+
+
+@pytest.fixture(params=['sample', 'messy'])
+def csv_path(request, messy_path):
+    return SAMPLE_PATH if request.param == 'sample' else messy_path
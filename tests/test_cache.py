@@ -0,0 +1,37 @@
+"""The cache built chunk by chunk must hold what cleaning the whole CSV at once gives."""
+
+import pandas as pd
+import pytest
+
+from zomato import cache
+from zomato.ingest import ENCODING
+from zomato.schema import apply_schema
+
+
+def assert_same_report(report, expected):
+    assert report['rejected_rates'] == expected['rejected_rates']
+    # Arrow-backed strings carry a few bytes of buffers (validity bitmaps) per chunk.
+    for key in ('memory_before', 'memory_after'):
+        assert report[key] == pytest.approx(expected[key], rel=0.01, abs=8)
+
+
+@pytest.mark.parametrize('chunksize', [7, 1000, 100_000])
+def test_chunked_build_matches_whole_frame(csv_path, tmp_path, chunksize):
+    expected, expected_report = apply_schema(pd.read_csv(csv_path, encoding=ENCODING))
+
+    df, report = cache.load_clean(csv_path, str(tmp_path), chunksize=chunksize)
+    pd.testing.assert_frame_equal(df, expected)
+    assert_same_report(report, expected_report)
+    # Served from the cache file now, batch by batch.
+    chunks, report = cache.clean_chunks(csv_path, str(tmp_path), chunksize=chunksize)
+    pd.testing.assert_frame_equal(pd.concat(list(chunks), ignore_index=True), expected)
+    assert_same_report(report, expected_report)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == ['.feather', '.json']
+
+
+def test_without_pyarrow(csv_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'feather', None)
+    expected, expected_report = apply_schema(pd.read_csv(csv_path, encoding=ENCODING))
+    df, report = cache.load_clean(csv_path, str(tmp_path), chunksize=100)
+    pd.testing.assert_frame_equal(df, expected)
+    assert_same_report(report, expected_report)
@@ -0,0 +1,33 @@
+"""The DuckDB backend must produce what the pandas path produces."""
+
+import pytest
+
+from parity import check_parity, with_duckdb, with_pandas
+from zomato.engine import sql_aggregates
+
+pytest.importorskip('duckdb')
+
+FILTERS = [
+    {'online_order': [True]},
+    {'listed_in(type)': ['Cafe', 'Buffet'], 'rate': (3.5, 4.5)},
+    {'approx_cost(for two people)': (300, 700), 'book_table': [False]},
+]
+
+
+def assert_same(path, filters=None):
+    # Filtered frames keep the rejected count of the whole parse.
+    check_parity(with_pandas(path, filters), with_duckdb(path, filters), rejected=not filters)
+
+
+def test_unfiltered_matches_pandas(csv_path):
+    assert_same(csv_path)
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_filtered_matches_pandas(csv_path, filters):
+    assert_same(csv_path, filters)
+
+
+def test_no_matching_rows(csv_path):
+    aggregator = sql_aggregates(csv_path, {'listed_in(type)': []})
+    assert aggregator.rows == 0
@@ -0,0 +1,68 @@
+"""Incremental updates must match a full streaming pass over the same bytes."""
+
+import pandas as pd
+import pytest
+
+from synthetic import SAMPLE_PATH
+from zomato.incremental import IncrementalAggregator
+from zomato.ingest import stream_aggregates
+
+
+def assert_matches_full_pass(incremental, path):
+    full = stream_aggregates(path, 50)
+    assert incremental.rows == full.rows
+    assert incremental.rejected_rates == full.rejected_rates
+    assert list(incremental.stats().to_dict().items()) == list(full.stats().to_dict().items())
+    pd.testing.assert_frame_equal(incremental.summary.top_voted.reset_index(drop=True),
+                                  full.summary.top_voted.reset_index(drop=True))
+
+
+@pytest.fixture
+def feed(tmp_path):
+    with open(SAMPLE_PATH, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    return tmp_path / 'feed.csv', lines
+
+
+def test_last_row_without_newline(feed):
+    path, lines = feed
+    path.write_bytes(b''.join(lines).rstrip(b'\r\n'))
+    incremental = IncrementalAggregator(str(path), str(path) + '.pkl', chunksize=50)
+    assert incremental.update() == len(lines) - 1
+    assert_matches_full_pass(incremental, str(path))
+    # Reloaded from the checkpoint, nothing is new.
+    again = IncrementalAggregator(str(path), str(path) + '.pkl', chunksize=50)
+    assert again.update() == 0
+    assert_matches_full_pass(again, str(path))
+
+
+def test_appends(feed):
+    path, lines = feed
+    head, appended = lines[:60], lines[60:]
+    path.write_bytes(b''.join(head))
+    checkpoint = str(path) + '.pkl'
+    assert IncrementalAggregator(str(path), checkpoint, chunksize=50).update() == len(head) - 1
+
+    # A writer stops mid-row, then finishes it along with the rest.
+    last = appended[-1]
+    with open(path, 'ab') as f:
+        f.write(b''.join(appended[:-1]) + last[:len(last) // 2])
+    incremental = IncrementalAggregator(str(path), checkpoint, chunksize=50)
+    assert incremental.update() == len(appended)
+    with open(path, 'ab') as f:
+        f.write(last[len(last) // 2:])
+    incremental = IncrementalAggregator(str(path), checkpoint, chunksize=50)
+    assert incremental.update() == 0
+    assert_matches_full_pass(incremental, str(path))
+
+
+def test_unreadable_checkpoint_is_rebuilt(feed, caplog):
+    path, lines = feed
+    path.write_bytes(b''.join(lines))
+    checkpoint = path.with_suffix('.pkl')
+    checkpoint.write_bytes(b'not a pickle')
+    incremental = IncrementalAggregator(str(path), str(checkpoint), chunksize=50)
+    assert 'unreadable checkpoint' in caplog.text
+    assert incremental.update() == len(lines) - 1
+    assert_matches_full_pass(incremental, str(path))
+    assert set(path.parent.iterdir()) == {path, checkpoint}
@@ -0,0 +1,32 @@
+"""Index lookups must match a boolean mask over the whole frame."""
+
+import numpy as np
+import pytest
+
+from synthetic import iter_synthetic
+from zomato.index import FrameIndex
+from zomato.schema import apply_schema
+
+FILTERS = [
+    {'listed_in(type)': ['Dining', 'Cafes', 'other'], 'online_order': [True]},
+    {'listed_in(type)': ['Buffet', 'Cafes'], 'book_table': [False, True], 'rate': (3.5, 4.2)},
+    {'online_order': [True, False], 'approx_cost(for two people)': (300, 700), 'rate': (4.0, 5.0)},
+    {'listed_in(type)': ['Dining', 'no such type'], 'approx_cost(for two people)': (0, 100)},
+]
+
+
+@pytest.fixture(scope='module')
+def frame():
+    df, _ = apply_schema(next(iter_synthetic(200_000, seed=3, messy=0.05)), measure_memory=False)
+    return df
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_multi_value_filters_on_a_large_frame(frame, filters):
+    mask = np.ones(len(frame), dtype=bool)
+    for column, condition in filters.items():
+        if isinstance(condition, tuple):
+            mask &= frame[column].between(*condition).to_numpy()
+        else:
+            mask &= frame[column].isin(condition).to_numpy()
+    np.testing.assert_array_equal(FrameIndex(frame).select(filters), np.flatnonzero(mask))
@@ -0,0 +1,69 @@
+"""Chunked ingestion must match the in-memory path whatever the chunk size."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from zomato.aggregates import FrameSummary, compute_stats
+from zomato.ingest import ENCODING, stream_aggregates
+from zomato.schema import apply_schema
+
+# From a few rows per chunk (group tables merged hundreds of times) to one chunk.
+CHUNK_SIZES = [7, 64, 1000, 100_000]
+
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_streaming_matches_in_memory(csv_path, chunksize):
+    df, report = apply_schema(pd.read_csv(csv_path, encoding=ENCODING), measure_memory=False)
+    stats, summary = compute_stats(df), FrameSummary.from_frame(df)
+    aggregator = stream_aggregates(csv_path, chunksize)
+    streamed = aggregator.summary
+
+    assert aggregator.rows == len(df)
+    assert aggregator.rejected_rates == report['rejected_rates']
+    assert list(aggregator.stats().to_dict().items()) == list(stats.to_dict().items())
+    pd.testing.assert_series_equal(streamed.missing, summary.missing)
+    pd.testing.assert_frame_equal(streamed.preview.reset_index(drop=True), summary.preview,
+                                  check_dtype=False, check_categorical=False)
+    pd.testing.assert_frame_equal(streamed.top_voted.reset_index(drop=True), summary.top_voted.reset_index(drop=True),
+                                  check_dtype=False, check_categorical=False)
+    assert streamed.champion == summary.champion
+
+    metrics, streamed_metrics = summary.to_dict(), streamed.to_dict()
+    # HyperLogLog registers merge exactly; merged Misra-Gries counts are lower
+    # bounds, off by at most the recorded error (zero until a chunk overflows).
+    del metrics['most_common_names']
+    streamed_names = streamed_metrics.pop('most_common_names')
+    assert metrics == streamed_metrics
+    exact = df['name'].value_counts()
+    error = streamed.names.heavy_hitters.error
+    for name, count in streamed_names.items():
+        assert exact[name] - error <= count <= exact[name]
+
+
+def test_ties_keep_the_original_order(tmp_path):
+    # Every type has the same count and the same vote total: value_counts()
+    # lists tied types by first appearance, sort_values() in its own order.
+    types = ['Dining', 'Buffet', 'other', 'Cafes']
+    raw = pd.DataFrame({'name': 'x', 'online_order': ['No', 'Yes'] * 4, 'book_table': 'No', 'rate': '4.0/5',
+                        'votes': 10, 'approx_cost(for two people)': 300, 'listed_in(type)': types * 2})
+    path = tmp_path / 'ties.csv'
+    raw.to_csv(path, index=False, encoding=ENCODING)
+    df, _ = apply_schema(pd.read_csv(path, encoding=ENCODING), measure_memory=False)
+
+    for stats in (compute_stats(df), stream_aggregates(str(path), 3).stats()):
+        assert list(stats.type_counts.index) == list(raw['listed_in(type)'].value_counts().index)
+        assert list(stats.online_counts.index) == list(raw['online_order'].value_counts().index)
+        assert (list(stats.type_votes.index) ==
+                list(raw.groupby('listed_in(type)')['votes'].sum().sort_values(ascending=False).index))
+
+
+def test_metrics_are_strict_json(messy_path):
+    # No online restaurants: their mean rating is missing, written as null.
+    raw = pd.read_csv(messy_path, encoding=ENCODING)
+    df, _ = apply_schema(raw[raw['online_order'] == 'No'], measure_memory=False)
+    metrics = compute_stats(df).to_dict()
+    assert metrics['rating']['online_mean'] is None
+    json.dumps(metrics, allow_nan=False)
+    json.dumps(FrameSummary.from_frame(df).to_dict(), allow_nan=False)
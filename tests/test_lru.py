@@ -0,0 +1,26 @@
+"""The LRU byte budget must cover frames and objects holding them, not just images."""
+
+import numpy as np
+import pandas as pd
+
+from zomato.lru import LRUCache, deep_size
+
+
+def test_frames_count_against_the_byte_budget():
+    frame = pd.DataFrame({'votes': np.arange(100_000), 'name': ['restaurant'] * 100_000})
+    assert deep_size(frame) >= frame.memory_usage(deep=True).sum()
+
+    cache = LRUCache(max_bytes=int(deep_size(frame) * 2.5))
+    cache.put('a', frame)
+    cache.put('b', {'frame': frame.copy()})
+    assert cache.info()['bytes'] > 2 * frame['votes'].nbytes
+    cache.put('c', frame.copy())
+    assert 'a' not in cache and 'c' in cache
+    assert cache.info()['evictions'] == 1
+
+
+def test_explicit_size():
+    cache = LRUCache(max_bytes=100)
+    cache.put('a', object(), size=60)
+    cache.put('b', object(), size=60)
+    assert 'a' not in cache and cache.info()['bytes'] == 60
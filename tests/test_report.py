@@ -0,0 +1,26 @@
+"""Batch reports: empty exports and failing files must not sink the batch."""
+
+import json
+import os
+import shutil
+
+from synthetic import SAMPLE_PATH
+from zomato.report import run
+
+
+def test_empty_and_broken_exports(tmp_path):
+    shutil.copy(SAMPLE_PATH, tmp_path / 'pune.csv')
+    with open(SAMPLE_PATH, 'rb') as src, open(tmp_path / 'delhi.csv', 'wb') as dst:
+        dst.write(src.readline())
+    (tmp_path / 'goa.csv').write_bytes(b'')
+    paths = [str(tmp_path / f'{city}.csv') for city in ('pune', 'delhi', 'goa')]
+
+    results, failures = run(paths, str(tmp_path / 'out'), jobs=2)
+
+    assert list(results) == paths[:2] and list(failures) == paths[2:]
+    assert results[paths[0]]['figures'] and results[paths[0]]['total_rows'] > 0
+    # A header-only export gets strict-JSON metrics and no figures.
+    assert results[paths[1]]['total_rows'] == 0 and results[paths[1]]['figures'] == []
+    with open(tmp_path / 'out' / 'delhi' / 'metrics.json') as f:
+        assert json.load(f)['rating']['mean'] is None
+    assert os.listdir(tmp_path / 'out' / 'delhi') == ['metrics.json']
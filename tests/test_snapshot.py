@@ -0,0 +1,70 @@
+"""Snapshot files: one per source, and always a usable snapshot from the warm-up."""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from synthetic import SAMPLE_PATH
+from zomato.aggregates import FrameSummary, compute_stats
+from zomato.dedup import chain_table
+from zomato.ingest import ENCODING, stream_aggregates
+from zomato.schema import apply_schema
+from zomato.snapshot import Snapshot, build_snapshot, warm_snapshot
+
+
+def fake_render(specs):
+    return {spec.name: b'png' for spec in specs}
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Two exports with the same file name in different directories."""
+    monkeypatch.chdir(tmp_path)
+    paths = []
+    for city in ('a', 'b'):
+        os.makedirs(city)
+        paths.append(shutil.copy(SAMPLE_PATH, os.path.join(city, 'zomato.csv')))
+    with open(paths[1], 'a', encoding='latin-1') as f:
+        f.write('Extra Cafe,Yes,No,4.0/5,10,300,Cafes\n')
+    return paths
+
+
+def test_same_file_names_keep_their_own_snapshots(sources):
+    built = [build_snapshot(path, 'snapshots', fake_render) for path in sources]
+    assert built[0] != built[1]
+    assert all(os.path.exists(path) for path in built)
+    snapshots = [Snapshot.open(path, snapshot_dir='snapshots') for path in sources]
+    assert [snapshot.stats.total_rows for snapshot in snapshots] == [148, 149]
+    for snapshot in snapshots:
+        snapshot.close()
+
+
+def test_warm_snapshot_when_the_source_changes_during_the_build(sources):
+    path = sources[0]
+
+    def render_then_append(specs):
+        with open(path, 'a', encoding='latin-1') as f:
+            f.write('Late Cafe,Yes,No,4.0/5,10,300,Cafes\n')
+        return fake_render(specs)
+
+    snapshot = warm_snapshot(path, snapshot_dir='snapshots', render=render_then_append)
+    assert snapshot is not None
+    assert snapshot.stats.total_rows == 148
+    snapshot.close()
+
+
+@pytest.mark.parametrize('chunksize', [7, 100_000])
+def test_built_from_chunks_like_the_whole_frame(csv_path, tmp_path, monkeypatch, chunksize):
+    monkeypatch.chdir(tmp_path)
+    df, _ = apply_schema(pd.read_csv(csv_path, encoding=ENCODING), measure_memory=False)
+    snapshot = Snapshot(build_snapshot(csv_path, 'snapshots', fake_render, chunksize=chunksize))
+
+    assert list(snapshot.stats.to_dict().items()) == list(compute_stats(df).to_dict().items())
+    # Name counts merged across chunks are lower bounds, as in stream_aggregates().
+    assert snapshot.summary.to_dict() == stream_aggregates(csv_path, chunksize).summary.to_dict()
+    if chunksize >= len(df):
+        assert snapshot.summary.to_dict() == FrameSummary.from_frame(df).to_dict()
+    pd.testing.assert_frame_equal(snapshot.chains, chain_table(df))
+    snapshot.close()
@@ -0,0 +1 @@
+"""Data pipeline behind the Zomato analysis dashboard."""
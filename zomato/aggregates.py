@@ -0,0 +1,358 @@
+"""Single-pass aggregation of every dashboard statistic.
+
+The frame is scanned once, in a single ``groupby`` on
+(``listed_in(type)``, ``online_order``, ``rate``, cost), counting restaurants
+and summing votes per group. The number of groups is bounded by the number of
+distinct key combinations, not by the number of rows, and every statistic the
+dashboard shows -- type counts, vote totals, online adoption, the rating and
+cost distributions and their mean/median/min/max, the rating histogram and
+boxplot summaries, the online-vs-offline means and the type x online pivot --
+is derived from that small table.
+
+Group tables are also mergeable: summing the tables of two disjoint slices
+gives the table of their union, which is what the chunked ingestion layer
+relies on.
+"""
+
+import copy
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from zomato.profiling import stage
+from zomato.schema import YES_NO, downcast_int
+from zomato.topk import ColumnSketch, top_rows
+
+TYPE_COL = 'listed_in(type)'
+COST_COL = 'approx_cost(for two people)'
+GROUP_KEYS = [TYPE_COL, 'online_order', 'rate', COST_COL]
+
+
+def group_table(df):
+    """Restaurant count and vote total per (type, online_order, rate, cost)."""
+    return (df.groupby(GROUP_KEYS, observed=True, dropna=False, sort=False)
+              .agg(restaurants=('votes', 'size'), votes=('votes', 'sum'))
+              .reset_index())
+
+
+def merge_group_tables(tables):
+    """Combine group tables of disjoint slices into the table of their union."""
+    combined = pd.concat(tables, ignore_index=True)
+    return (combined.groupby(GROUP_KEYS, observed=True, dropna=False, sort=False)
+                    [['restaurants', 'votes']].sum()
+                    .reset_index())
+
+
+def _price_points(counts):
+    """``counts`` keyed by integer costs: a cost column with gaps is float, but the gaps are gone here."""
+    counts = counts.copy()
+    counts.index = pd.Index(downcast_int(counts.index.to_series()), name=counts.index.name)
+    return counts
+
+
+def _series(values):
+    """``values`` as a dict keyed by the string form of its index."""
+    return dict(zip(map(str, values.index), values.tolist()))
+
+
+def _json_safe(value):
+    """``value`` with every NaN (or other missing scalar), at any depth, replaced by None.
+
+    A bare NaN token is not valid JSON: a missing rating, or the mean of an
+    empty selection, is written as null.
+    """
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return value
+
+
+def _compact(rows):
+    """``rows`` with every categorical cut down to the categories it uses.
+
+    The few rows a summary keeps would otherwise carry every category of the
+    frame, which pandas hashes again each time they are concatenated or a row
+    is taken out.
+    """
+    used = {column: values.cat.remove_unused_categories()
+            for column, values in rows.items() if isinstance(values.dtype, pd.CategoricalDtype)}
+    return rows.assign(**used) if used else rows
+
+
+def weighted_mean(counts):
+    """Mean of the values in ``counts.index`` weighted by ``counts``."""
+    total = counts.sum()
+    if not total:
+        return np.nan
+    return float((counts.index.to_numpy(dtype=float) * counts.to_numpy()).sum() / total)
+
+
+def weighted_quantile(counts, q):
+    """Quantile of a value -> count distribution, interpolated like ``Series.quantile``."""
+    counts = counts[counts > 0].sort_index()
+    total = int(counts.sum())
+    if not total:
+        return np.nan
+    position = q * (total - 1)
+    lower, upper = int(np.floor(position)), int(np.ceil(position))
+    # searchsorted over the running count finds the value at a given rank.
+    cumulative = counts.to_numpy().cumsum()
+    values = counts.index.to_numpy(dtype=float)
+    low = values[np.searchsorted(cumulative, lower, side='right')]
+    high = values[np.searchsorted(cumulative, upper, side='right')]
+    return float(low + (high - low) * (position - lower))
+
+
+def weighted_box_stats(counts, label=None, whis=1.5, max_fliers=100, seed=0):
+    """Boxplot statistics of a value -> count distribution, for ``Axes.bxp``.
+
+    Quartiles and whiskers are exact and follow ``matplotlib.cbook.boxplot_stats``.
+    Outliers are reduced to a capped sample of distinct values, split between
+    the low and high side in proportion to how many rows fall on each, and
+    drawn with probability proportional to their count, so a few hundred
+    markers stand in for however many outlying rows there are.
+    """
+    counts = counts[counts > 0].sort_index()
+    values = counts.index.to_numpy(dtype=float)
+    weights = counts.to_numpy()
+    q1, med, q3 = (weighted_quantile(counts, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+    whislo = inside.min() if len(inside) else q1
+    whishi = inside.max() if len(inside) else q3
+
+    rng = np.random.default_rng(seed)
+    sides = [values < whislo, values > whishi]
+    outlying = sum(int(weights[side].sum()) for side in sides)
+    fliers = []
+    for side in sides:
+        side_values, side_weights = values[side], weights[side]
+        if not len(side_values):
+            continue
+        quota = max(1, round(max_fliers * side_weights.sum() / outlying))
+        size = min(quota, len(side_values))
+        fliers.append(rng.choice(side_values, size=size, replace=False, p=side_weights / side_weights.sum()))
+    return {
+        'label': label,
+        'q1': q1, 'med': med, 'q3': q3, 'iqr': iqr,
+        'whislo': whislo, 'whishi': whishi,
+        'mean': weighted_mean(counts),
+        'fliers': np.sort(np.concatenate(fliers)) if fliers else np.array([]),
+        'n': int(weights.sum()),
+        'n_fliers': outlying,
+    }
+
+
+def _yes_no_labels(values):
+    if pd.api.types.is_bool_dtype(values):
+        return values.map(YES_NO)
+    return values
+
+
+@dataclass
+class DashboardStats:
+    """Everything the dashboard Steps read, derived from one group table."""
+
+    groups: pd.DataFrame
+    total_rows: int
+    type_counts: pd.Series
+    type_votes: pd.Series
+    online_counts: pd.Series
+    rate_counts: pd.Series
+    online_rate_counts: pd.DataFrame
+    cost_counts: pd.Series
+    online_pivot: pd.DataFrame
+
+    @classmethod
+    def from_groups(cls, groups):
+        groups = groups.assign(online_order=_yes_no_labels(groups['online_order']))
+        by_type = groups.groupby(TYPE_COL, observed=True)
+        # Ties keep the order value_counts() gives them, first appearance (group
+        # tables keep rows in order of first appearance), so stable sorts only.
+        type_counts = (groups.groupby(TYPE_COL, observed=True, sort=False)['restaurants'].sum()
+                             .sort_values(ascending=False, kind='stable').rename('count'))
+        # Both Yes and No are always present, even when a filter leaves only one.
+        labels = list(YES_NO.values())
+        online_counts = groups.groupby('online_order', sort=False)['restaurants'].sum()
+        online_counts = (online_counts.reindex(list(online_counts.index) +
+                                               [label for label in labels if label not in online_counts.index],
+                                               fill_value=0)
+                         .sort_values(ascending=False, kind='stable').rename('count'))
+        # The same call as groupby(type)['votes'].sum().sort_values(ascending=False)
+        # on the rows, over the same type order and the same int64/float64 dtype:
+        # numpy's default sort orders ties differently for narrower integers.
+        type_votes = by_type['votes'].sum()
+        if pd.api.types.is_integer_dtype(type_votes.dtype):
+            type_votes = type_votes.astype(np.int64)
+        online_pivot = groups.pivot_table(index=TYPE_COL, columns='online_order', values='restaurants',
+                                          aggfunc='sum', fill_value=0, observed=True)
+        online_pivot = online_pivot.reindex(columns=online_pivot.columns.union(labels), fill_value=0)
+        return cls(
+            groups=groups,
+            total_rows=int(groups['restaurants'].sum()),
+            type_counts=type_counts,
+            type_votes=type_votes.sort_values(ascending=False),
+            online_counts=online_counts,
+            rate_counts=groups.groupby('rate')['restaurants'].sum().sort_index(),
+            online_rate_counts=groups.pivot_table(index='rate', columns='online_order', values='restaurants',
+                                                  aggfunc='sum', fill_value=0),
+            cost_counts=_price_points(groups.groupby(COST_COL)['restaurants'].sum().sort_index().rename('count')),
+            online_pivot=online_pivot,
+        )
+
+    # Ratings
+    @property
+    def rate_mean(self):
+        return weighted_mean(self.rate_counts)
+
+    @property
+    def rate_median(self):
+        return weighted_quantile(self.rate_counts, 0.5)
+
+    @property
+    def rate_min(self):
+        return float(self.rate_counts.index.min())
+
+    @property
+    def rate_max(self):
+        return float(self.rate_counts.index.max())
+
+    def rate_mean_for(self, online):
+        """Average rating of restaurants with ``online_order`` equal to ``online`` ('Yes'/'No')."""
+        if online not in self.online_rate_counts:
+            return np.nan
+        return weighted_mean(self.online_rate_counts[online])
+
+    def rate_box_stats(self, order=('Yes', 'No'), max_fliers=100):
+        """Per-``online_order`` boxplot statistics of the ratings (see :func:`weighted_box_stats`)."""
+        return [weighted_box_stats(self.online_rate_counts[label], label=label, max_fliers=max_fliers)
+                for label in order if label in self.online_rate_counts]
+
+    def rate_histogram(self, bins=20):
+        """Bin counts and edges matching ``plt.hist(df['rate'], bins=bins)``."""
+        counts, edges = np.histogram(self.rate_counts.index.to_numpy(dtype=float), bins=bins,
+                                     weights=self.rate_counts.to_numpy())
+        return counts.astype('int64'), edges
+
+    # Cost
+    @property
+    def cost_mean(self):
+        return weighted_mean(self.cost_counts)
+
+    @property
+    def cost_median(self):
+        return weighted_quantile(self.cost_counts, 0.5)
+
+    @property
+    def cost_min(self):
+        return float(self.cost_counts.index.min())
+
+    @property
+    def cost_max(self):
+        return float(self.cost_counts.index.max())
+
+    def to_dict(self):
+        """JSON-serializable summary of every statistic, as written by ``zomato-report``."""
+        return _json_safe({
+            'total_rows': self.total_rows,
+            'type_counts': _series(self.type_counts),
+            'type_votes': _series(self.type_votes),
+            'online_counts': _series(self.online_counts),
+            'rating': {
+                'mean': self.rate_mean, 'median': self.rate_median,
+                'min': self.rate_min, 'max': self.rate_max,
+                'online_mean': self.rate_mean_for('Yes'), 'offline_mean': self.rate_mean_for('No'),
+            },
+            'cost': {
+                'mean': self.cost_mean, 'median': self.cost_median,
+                'min': self.cost_min, 'max': self.cost_max,
+                'top_20': _series(self.cost_counts.nlargest(20)),
+            },
+            'online_pivot': {str(column): _series(self.online_pivot[column]) for column in self.online_pivot},
+        })
+
+
+@dataclass
+class FrameSummary:
+    """The row-level bits of the dashboard: preview rows, missing counts, most voted restaurants.
+
+    ``top_voted`` holds the :attr:`TOP_VOTED` most voted restaurants plus any
+    tied with the last of them, found by partial selection rather than a sort.
+    ``names`` and ``costs`` are bounded-memory sketches (see :mod:`zomato.topk`)
+    of the restaurant names and price points: their most frequent values and
+    distinct counts.
+
+    Like group tables these merge, so they can be built chunk by chunk or file
+    by file without holding the whole frame.
+    """
+
+    columns: list
+    preview: pd.DataFrame
+    missing: pd.Series
+    champion: dict
+    top_voted: pd.DataFrame
+    names: ColumnSketch
+    costs: ColumnSketch
+
+    PREVIEW_ROWS = 10
+    TOP_VOTED = 10
+
+    @classmethod
+    def from_frame(cls, df):
+        top_voted = _compact(top_rows(df[['name', 'votes', 'rate']], 'votes', cls.TOP_VOTED))
+        return cls(
+            columns=df.columns.tolist(),
+            preview=_compact(df.head(cls.PREVIEW_ROWS)),
+            missing=df.isnull().sum(),
+            champion=cls.champion_of(top_voted),
+            top_voted=top_voted,
+            names=ColumnSketch.from_values(df['name']),
+            costs=ColumnSketch().update_counts(_price_points(df[COST_COL].value_counts())),
+        )
+
+    @staticmethod
+    def champion_of(top_voted):
+        # Ties keep row order, so this is the first row holding the maximum,
+        # like the original ``df.loc[df['votes'] == max_votes].values[0]``.
+        if not len(top_voted):
+            return {}
+        row = top_voted.iloc[0]
+        return {'name': row['name'], 'votes': int(row['votes']), 'rate': row['rate']}
+
+    def merge(self, other):
+        """Summary of this slice followed by ``other``."""
+        preview = self.preview
+        if len(preview) < self.PREVIEW_ROWS:
+            preview = pd.concat([preview, other.preview]).head(self.PREVIEW_ROWS)
+        top_voted = top_rows(pd.concat([self.top_voted, other.top_voted]), 'votes', self.TOP_VOTED)
+        return FrameSummary(
+            columns=self.columns,
+            preview=preview,
+            missing=self.missing.add(other.missing, fill_value=0).astype('int64'),
+            champion=self.champion_of(top_voted),
+            top_voted=top_voted,
+            names=copy.deepcopy(self.names).merge(other.names),
+            costs=copy.deepcopy(self.costs).merge(other.costs),
+        )
+
+    def to_dict(self):
+        """JSON-serializable most voted restaurants and sketch estimates, as written by ``zomato-report``."""
+        return _json_safe({
+            'top_voted': self.top_voted.to_dict('records'),
+            'distinct_restaurants': self.names.distinct_count(),
+            'most_common_names': _series(self.names.top(10)),
+            'distinct_price_points': self.costs.distinct_count(),
+            'top_price_points': _series(self.costs.top(20)),
+        })
+
+
+def compute_stats(df):
+    """Scan ``df`` once and return its :class:`DashboardStats`."""
+    with stage("group table"):
+        groups = group_table(df)
+    with stage("derive stats"):
+        return DashboardStats.from_groups(groups)
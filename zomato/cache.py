@@ -0,0 +1,274 @@
+"""Columnar cache for the cleaned dataset.
+
+The first load parses the CSV, applies the dtype schema and writes the result to an Arrow IPC
+(Feather) file keyed by the SHA-256 of the source. Later loads memory-map that
+file instead of parsing the CSV again. A small JSON sidecar records the
+source's size and mtime: if they still match, the cache is used without
+re-hashing; if they changed, the source is re-hashed and a new cache file is
+written only when the contents actually differ.
+
+The CSV is parsed and cleaned in bounded-size chunks (see
+:func:`~zomato.ingest.iter_chunks`): cleaned chunks are spilled to temporary
+files while :class:`~zomato.schema.ChunkedSchema` learns the dtypes of the
+whole file, then conformed to them and written as record batches. Building
+the cache therefore never holds the parsed CSV in memory, and
+:func:`clean_chunks` reads it back one record batch at a time.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from zomato.ingest import DATA_PATH, DEFAULT_CHUNKSIZE, iter_chunks
+from zomato.profiling import stage
+from zomato.schema import ChunkedSchema, apply_schema, memory_usage
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow is optional
+    feather = None
+
+CACHE_DIR = ".cache"
+# Bump whenever the cleaned frame changes shape so old cache files are rebuilt.
+CACHE_VERSION = 3
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _clean(path, chunksize, schema, report):
+    """Yield the cleaned chunks of ``path``, adding each to ``schema`` and its counts to ``report``."""
+    before = Counter()
+    report['rejected_rates'] = 0
+    for chunk in iter_chunks(path, chunksize):
+        before.update(memory_usage(chunk))
+        chunk, chunk_report = apply_schema(chunk, measure_memory=False)
+        report['rejected_rates'] += chunk_report['rejected_rates']
+        schema.add(chunk)
+        yield chunk
+    report['memory_before'] = dict(before)
+
+
+def _chunk_memory(chunk):
+    """Per-column memory of ``chunk``, leaving out categories, which every conformed chunk shares."""
+    return {column: int(values.cat.codes.memory_usage(index=False)
+                        if isinstance(values.dtype, pd.CategoricalDtype)
+                        else values.memory_usage(index=False, deep=True))
+            for column, values in chunk.items()}
+
+
+def _memory_after(memory, dtypes):
+    """Per-column memory of the whole frame from the :func:`_chunk_memory` of its chunks, summed."""
+    # The categories' values only: Index.memory_usage() also counts the hash table conforming built.
+    return {column: memory[column] + (int(pd.Series(dtype.categories).memory_usage(index=False, deep=True))
+                                      if isinstance(dtype, pd.CategoricalDtype) else 0)
+            for column, dtype in dtypes.items()}
+
+
+def _parse(path, chunksize=DEFAULT_CHUNKSIZE):
+    """``(df, report)`` for ``path`` when there is no cache file to stream through."""
+    schema, report, memory = ChunkedSchema(), {}, Counter()
+    with stage("parse and clean"):
+        chunks = list(_clean(path, chunksize, schema, report))
+    chunks = [schema.conform(chunk) for chunk in chunks]
+    for chunk in chunks:
+        memory.update(_chunk_memory(chunk))
+    report['memory_after'] = _memory_after(memory, schema.dtypes())
+    return pd.concat(chunks, ignore_index=True), report
+
+
+def _build(path, cache_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Write the cleaned frame of ``path`` to the Feather file ``cache_path``; return its report.
+
+    Cleaned chunks are spilled to temporary Feather files until the dtypes of
+    the whole file are known, then conformed and appended as record batches.
+    """
+    schema, report, memory = ChunkedSchema(), {}, Counter()
+    with tempfile.TemporaryDirectory(prefix='spill-', dir=os.path.dirname(cache_path) or None) as spill_dir:
+        parts = []
+        with stage("parse and clean"):
+            for chunk in _clean(path, chunksize, schema, report):
+                parts.append(os.path.join(spill_dir, f"{len(parts)}.feather"))
+                feather.write_feather(chunk, parts[-1], compression='uncompressed')
+
+        def write(tmp):
+            writer = None
+            try:
+                for part in parts:
+                    chunk = schema.conform(feather.read_feather(part))
+                    memory.update(_chunk_memory(chunk))
+                    if writer is None:
+                        arrow_schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                        writer = pa.ipc.new_file(tmp, arrow_schema)
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=arrow_schema, preserve_index=False))
+                    os.remove(part)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+        with stage("write cache"):
+            _write_atomic(cache_path, write)
+    # Arrow's allocator keeps the pages of every freed chunk for reuse; hand
+    # them back so the build's peak doesn't stay resident after it.
+    pa.default_memory_pool().release_unused()
+    report['memory_after'] = _memory_after(memory, schema.dtypes())
+    return report
+
+
+def source_key(path):
+    """File-name stem for what is cached about ``path``: its name plus a hash of its absolute path.
+
+    The hash keeps sources with the same name in different directories
+    (``a/zomato.csv``, ``b/zomato.csv``) from sharing cache files.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:8]}"
+
+
+def _meta_path(path, cache_dir):
+    stem = source_key(path)
+    return stem, os.path.join(cache_dir, f"{stem}.json")
+
+
+def _source_sha256(path, meta, stat):
+    # Trust the recorded hash while size and mtime are unchanged.
+    if meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns:
+        return meta['sha256']
+    return file_sha256(path)
+
+
+def dataset_version(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Content hash identifying the current version of ``path``.
+
+    Cheap while the file is unchanged: the hash recorded by :func:`load_clean`
+    is reused as long as the file's size and mtime still match.
+    """
+    _, meta_path = _meta_path(path, cache_dir)
+    return _source_sha256(path, _read_meta(meta_path), os.stat(path))
+
+
+def _clean_table(path, cache_dir, chunksize):
+    """``(table, report)``: the cleaned frame of ``path`` as a memory-mapped Arrow table."""
+    os.makedirs(cache_dir, exist_ok=True)
+    stem, meta_path = _meta_path(path, cache_dir)
+    meta = _read_meta(meta_path)
+    stat = os.stat(path)
+    sha256 = _source_sha256(path, meta, stat)
+
+    cache_path = os.path.join(cache_dir, f"{stem}-{sha256[:16]}.feather")
+    if (meta.get('version') == CACHE_VERSION and meta.get('sha256') == sha256
+            and os.path.exists(cache_path)):
+        report = meta['report']
+    else:
+        report = _build(path, cache_path, chunksize)
+        stale = meta.get('cache_file')
+        if stale and stale != os.path.basename(cache_path):
+            try:
+                os.remove(os.path.join(cache_dir, stale))
+            except OSError:
+                pass
+
+    new_meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256,
+        'cache_file': os.path.basename(cache_path),
+        'report': report,
+    }
+
+    if new_meta != meta:
+        def write_meta(tmp):
+            with open(tmp, 'w') as f:
+                json.dump(new_meta, f, indent=2)
+        _write_atomic(meta_path, write_meta)
+    # Mapped before anything else can replace the file; the mapping outlives a removal.
+    return feather.read_table(cache_path, memory_map=True), report
+
+
+def _to_pandas(data, dtypes=None):
+    """``data``, a Table or RecordBatch read from the cache, as a DataFrame.
+
+    Every batch of a dictionary column shares the file's one dictionary.
+    Arrow's own conversion rebuilds the categories through Python strings;
+    here the dictionary is converted once, without copying, and each
+    categorical is built from its codes. ``dtypes`` keeps the converted
+    dictionaries between calls.
+    """
+    columns = [field.name for field in data.schema if pa.types.is_dictionary(field.type)]
+    if not columns or not data.num_rows:
+        return data.to_pandas()
+    dtypes = {} if dtypes is None else dtypes
+    df = data.drop_columns(columns).to_pandas()
+    for column in columns:
+        values = data.column(column)
+        chunks = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+        if column not in dtypes:
+            dtypes[column] = pd.CategoricalDtype(pd.Index(chunks[0].dictionary.to_pandas()),
+                                                 ordered=chunks[0].type.ordered)
+        codes = np.concatenate([chunk.indices.fill_null(-1).to_numpy() for chunk in chunks])
+        df.insert(data.schema.get_field_index(column), column,
+                  pd.Categorical.from_codes(codes, dtype=dtypes[column]))
+    return df
+
+
+def load_clean(path=DATA_PATH, cache_dir=CACHE_DIR, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Return ``(df, report)`` for ``path``, using the cache when valid.
+
+    ``report`` is the :func:`~zomato.schema.apply_schema` report of the parse
+    that produced the cache. ``columns`` limits the frame to those columns
+    (any that don't exist are left out).
+    """
+    if feather is None:
+        df, report = _parse(path, chunksize)
+        return (df if columns is None else df[[column for column in columns if column in df]]), report
+    table, report = _clean_table(path, cache_dir, chunksize)
+    with stage("read cache"):
+        if columns is not None:
+            table = table.select([column for column in columns if column in table.column_names])
+        return _to_pandas(table), report
+
+
+def clean_chunks(path=DATA_PATH, cache_dir=CACHE_DIR, chunksize=DEFAULT_CHUNKSIZE):
+    """Return ``(chunks, report)``: the cleaned frame of ``path`` as an iterator of DataFrames.
+
+    Every chunk has the dtypes :func:`load_clean` gives the whole frame. They
+    are read one record batch at a time from the memory-mapped cache, so
+    folding them into running aggregates never holds the whole frame.
+    """
+    if feather is None:
+        df, report = _parse(path, chunksize)
+        return iter([df]), report
+    table, report = _clean_table(path, cache_dir, chunksize)
+    dtypes = {}
+    return (_to_pandas(batch, dtypes) for batch in table.to_batches()), report
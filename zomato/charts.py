@@ -0,0 +1,140 @@
+"""Matplotlib/Seaborn figures shown by the dashboard.
+
+Each builder takes the precomputed :class:`~zomato.aggregates.DashboardStats`
+and returns a Figure; none of them touch the row-level frame.
+:func:`render_image` turns a figure into the PNG bytes Streamlit displays.
+"""
+
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from zomato.profiling import stage
+
+# Same options st.pyplot uses, so cached PNGs look identical.
+SAVEFIG_OPTIONS = {'dpi': 200, 'bbox_inches': 'tight'}
+
+
+def render_image(fig, fmt='png'):
+    """Serialize ``fig`` to PNG (or SVG) bytes and close it."""
+    buffer = io.BytesIO()
+    with stage("savefig"):
+        fig.savefig(buffer, format=fmt, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def type_counts_bar(stats):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    type_counts = stats.type_counts
+    colors = sns.color_palette("husl", len(type_counts))
+    ax.bar(type_counts.index.astype(str), type_counts.values, color=colors)
+    plt.xticks(rotation=45, ha='right')
+    plt.xlabel('Restaurant Type', fontsize=12, fontweight='bold')
+    plt.ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
+    plt.title('Count of Restaurants by Type', fontsize=14, fontweight='bold', pad=20)
+    plt.tight_layout()
+    return fig
+
+
+def type_votes_line(stats):
+    grouped_data = stats.type_votes
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(grouped_data.index.astype(str), grouped_data.values, c='#e23744', marker='o', linewidth=3, markersize=10)
+    plt.xticks(rotation=45, ha='right')
+    plt.xlabel('Restaurant Type', fontsize=12, fontweight='bold')
+    plt.ylabel('Total Votes', fontsize=12, fontweight='bold')
+    plt.title('Customer Engagement by Restaurant Type', fontsize=14, fontweight='bold', pad=20)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def online_pie(stats):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    online_counts = stats.online_counts
+    colors = ['#4CAF50', '#FF5252']
+    ax.pie(online_counts.values, labels=online_counts.index, autopct='%1.1f%%',
+           colors=colors, startangle=90, textprops={'fontsize': 12, 'fontweight': 'bold'})
+    ax.set_title('Online Order Availability', fontsize=14, fontweight='bold', pad=20)
+    plt.tight_layout()
+    return fig
+
+
+def online_count_bar(stats):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    online_counts = stats.online_counts
+    order = ['Yes', 'No']
+    sns.barplot(x=online_counts.index, y=online_counts.values, hue=online_counts.index, order=order,
+                hue_order=order, palette=['#4CAF50', '#FF5252'], legend=False, ax=ax)
+    ax.set_xlabel('Online Order Available', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
+    ax.set_title('Restaurant Count by Online Order Availability', fontsize=14, fontweight='bold', pad=20)
+    plt.tight_layout()
+    return fig
+
+
+def rating_histogram(stats):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    hist_counts, hist_edges = stats.rate_histogram(bins=20)
+    n, bins, patches = plt.hist(hist_edges[:-1], bins=hist_edges, weights=hist_counts,
+                                color='#667eea', edgecolor='black', alpha=0.7)
+
+    # Color gradient
+    cm = plt.cm.RdYlGn
+    for i, patch in enumerate(patches):
+        patch.set_facecolor(cm(i / len(patches)))
+
+    plt.xlabel('Rating', fontsize=12, fontweight='bold')
+    plt.ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
+    plt.title('Distribution of Restaurant Ratings', fontsize=14, fontweight='bold', pad=20)
+    plt.axvline(stats.rate_mean, color='red', linestyle='--', linewidth=2, label=f'Average: {stats.rate_mean:.2f}')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def cost_top20_bar(stats):
+    fig, ax = plt.subplots(figsize=(14, 6))
+    top_costs = stats.cost_counts.nlargest(20)
+    colors = plt.cm.viridis(np.linspace(0, 1, len(top_costs)))
+    ax.bar(range(len(top_costs)), top_costs.values, color=colors)
+    ax.set_xticks(range(len(top_costs)))
+    ax.set_xticklabels(top_costs.index, rotation=45, ha='right')
+    plt.xlabel('Approximate Cost for Two People', fontsize=12, fontweight='bold')
+    plt.ylabel('Number of Restaurants', fontsize=12, fontweight='bold')
+    plt.title('Top 20 Most Common Price Points', fontsize=14, fontweight='bold', pad=20)
+    plt.tight_layout()
+    return fig
+
+
+def online_rating_boxplot(stats):
+    # Drawn from precomputed quartiles/whiskers and a capped outlier sample,
+    # so the cost doesn't grow with the number of restaurants.
+    fig, ax = plt.subplots(figsize=(10, 7))
+    box_stats = stats.rate_box_stats(order=('Yes', 'No'))
+    boxes = ax.bxp(box_stats, patch_artist=True, widths=0.8,
+                   medianprops={'color': 'black', 'linewidth': 1.5},
+                   flierprops={'marker': 'o', 'markerfacecolor': 'none', 'markeredgecolor': '#3d3d3d'})
+    for patch, color in zip(boxes['boxes'], ['#4CAF50', '#FF5252']):
+        patch.set_facecolor(color)
+    ax.set_xlabel('Online Order Available', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Rating', fontsize=12, fontweight='bold')
+    ax.set_title('Rating Distribution: Online vs Offline Orders', fontsize=14, fontweight='bold', pad=20)
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+    return fig
+
+
+def type_online_heatmap(stats):
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(stats.online_pivot, annot=True, cmap='YlOrRd', fmt='d', ax=ax, cbar_kws={'label': 'Number of Restaurants'},
+                linewidths=0.5, linecolor='gray')
+    plt.title('Restaurant Type vs Online Order Availability', fontsize=14, fontweight='bold', pad=20)
+    plt.xlabel('Online Order Available', fontsize=12, fontweight='bold')
+    plt.ylabel('Restaurant Type', fontsize=12, fontweight='bold')
+    plt.tight_layout()
+    return fig
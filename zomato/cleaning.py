@@ -0,0 +1,32 @@
+"""Cleaning helpers shared by the dashboard and the ingestion layer."""
+
+import numpy as np
+import pandas as pd
+
+
+def handleRate(value):
+    value = str(value).split('/')
+    value = value[0]
+    return float(value)
+
+
+def parse_rates(values):
+    """Vectorized version of ``values.apply(handleRate)``.
+
+    Ratings only take a few dozen distinct strings ("4.1/5", "NEW", ...), so
+    the column is factorized and just the unique values are parsed, then
+    broadcast back with a single take. Values that can't be parsed become NaN
+    instead of raising.
+
+    Returns ``(rates, rejected)`` where ``rejected`` is the number of
+    non-missing values that could not be parsed.
+    """
+    codes, uniques = pd.factorize(values)
+    numerator = pd.Series(uniques).astype(str).str.split('/', n=1).str[0].str.strip()
+    parsed = pd.to_numeric(numerator, errors='coerce').to_numpy(dtype=float)
+    # Missing values get code -1, which picks up the trailing NaN.
+    parsed = np.append(parsed, np.nan)
+    rates = pd.Series(parsed[codes], index=values.index, name=values.name)
+    rejected = int(((codes >= 0) & np.isnan(rates.to_numpy())).sum())
+    return rates, rejected
+
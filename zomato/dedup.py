@@ -0,0 +1,213 @@
+"""Restaurant name deduplication and chain resolution.
+
+The export lists a restaurant once per ``listed_in(type)`` category it
+appears under, and chains show up under slightly different spellings
+("Cafe Coffee Day", "Cafe Cofee Day", "CAFE COFFEE DAY 2"). Counting rows
+therefore overstates the number of restaurants and counts their votes more
+than once. This module resolves every row to a canonical restaurant id in
+three steps, each linear in the number of distinct names:
+
+1. **Normalize.** Names are case-folded, accents and punctuation stripped,
+   "&" spelled out, filler words ("the", "restaurant") and trailing branch
+   numbers dropped. Names equal after this are the same restaurant; that is
+   a hash join, no comparison needed.
+2. **Block.** Each distinct normalized name gets a MinHash signature of its
+   character trigrams, cut into bands. Names only become candidate matches
+   when a whole band agrees, which is likely for names sharing most of
+   their trigrams and unlikely otherwise, so no name is compared with every
+   other (no O(n^2) pass). Each name in a band bucket is compared with the
+   bucket's first name only.
+3. **Verify and link.** Candidates whose trigram Jaccard similarity reaches
+   the threshold are linked, and connected components become the canonical
+   restaurants, named after their most frequent spelling.
+
+:func:`chain_table` builds per-chain metrics on top: listings, distinct
+outlets (the same restaurant with the same votes, rating and cost listed
+under several types counts once) and votes summed over outlets.
+"""
+
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+STOP_WORDS = ('the', 'restaurant', 'restaurants')
+# Identity columns of an outlet besides its name; a restaurant repeated under
+# several types agrees on all of them.
+OUTLET_COLUMNS = ['online_order', 'book_table', 'rate', 'votes', 'approx_cost(for two people)']
+
+MAX_NAME = 48
+BANDS = 8
+ROWS_PER_BAND = 3
+_PRIME = np.uint64((1 << 61) - 1)
+_BATCH = 20_000
+
+
+def _fold(name):
+    try:
+        # UTF-8 names read as Latin-1 ("CafÃ©"); repair them before folding accents.
+        name = name.encode('latin-1').decode('utf-8')
+    except UnicodeError:
+        pass
+    return unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+
+
+def normalize_names(names):
+    """Matching key of each name: lower case, ASCII letters and digits, no filler or branch number."""
+    names = pd.Series(names, dtype=object)
+    keys = names.dropna()
+    accented = ~keys.str.isascii().astype(bool)
+    keys[accented] = keys[accented].map(_fold)
+    # Arrow-backed strings run the regexes below several times faster than objects.
+    stop = '|'.join(STOP_WORDS)
+    keys = (keys.astype('str').str.lower()
+                .str.replace('&', ' and ', regex=False)
+                .str.replace(r"'s\b", 's', regex=True)
+                .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+                .str.replace(rf'\b(?:{stop})\b ?', '', regex=True)
+                .str.strip()
+                .str.replace(r'(?: \d+)+$', '', regex=True))  # "Onesta 2" is a branch of "Onesta"
+    return keys.reindex(names.index)
+
+
+def _trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _signatures(keys, seed=0):
+    """MinHash signatures (``len(keys)`` x BANDS*ROWS_PER_BAND) of the keys' character trigrams."""
+    perms = BANDS * ROWS_PER_BAND
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_PRIME), perms, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), perms, dtype=np.uint64)
+    signatures = np.empty((len(keys), perms), dtype=np.uint64)
+    for start in range(0, len(keys), _BATCH):
+        # Fixed-width bytes, one row per name: trigram codes are three
+        # shifted column slices, no Python loop over characters.
+        padded = np.array([f" {key} "[:MAX_NAME] for key in keys[start:start + _BATCH]], dtype=f'S{MAX_NAME}')
+        chars = padded.view(np.uint8).reshape(len(padded), MAX_NAME).astype(np.uint64)
+        lengths = np.char.str_len(padded)
+        codes = (chars[:, :-2] << np.uint64(16)) | (chars[:, 1:-1] << np.uint64(8)) | chars[:, 2:]
+        valid = np.arange(MAX_NAME - 2) < (lengths - 2)[:, None]
+        for i in range(perms):
+            # (a * x + b) mod p with x < 2**24 and a < 2**61 can overflow 64 bits;
+            # wrapping is fine for hashing, all that matters is a fixed permutation.
+            hashed = (codes * a[i] + b[i]) % _PRIME
+            hashed[~valid] = np.iinfo(np.uint64).max
+            signatures[start:start + _BATCH, i] = hashed.min(axis=1)
+    return signatures
+
+
+def _candidate_pairs(signatures):
+    """(member, representative) pairs of keys that share a whole band."""
+    pairs = []
+    positions = np.arange(len(signatures))
+    for band in range(BANDS):
+        # Fold the band's hashes into one bucket key and group with a hash table.
+        columns = signatures[:, band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        bucket_key = columns[:, 0].copy()
+        for column in columns.T[1:]:
+            bucket_key = bucket_key * np.uint64(0x9E3779B97F4A7C15) ^ column
+        bucket, uniques = pd.factorize(bucket_key)
+        # The first key in each bucket represents it.
+        first = np.full(len(uniques), len(positions))
+        np.minimum.at(first, bucket, positions)
+        representative = first[bucket]
+        linked = representative != positions
+        pairs.append(np.column_stack([positions[linked], representative[linked]]))
+    pairs = pd.DataFrame(np.concatenate(pairs), columns=['left', 'right']).drop_duplicates()
+    return pairs.to_numpy()
+
+
+def _components(n, left, right):
+    """Connected-component label (smallest member) of ``n`` nodes joined by the given edges."""
+    parent = np.arange(n)
+    while True:
+        # Hook each root onto the smaller root across every edge, then flatten.
+        low = np.minimum(parent[left], parent[right])
+        np.minimum.at(parent, parent[left], low)
+        np.minimum.at(parent, parent[right], low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        if np.array_equal(parent[left], parent[right]):
+            return parent
+
+
+@dataclass
+class NameResolution:
+    """Canonical restaurant of every row of a name column."""
+
+    ids: pd.Series
+    names: pd.Series
+
+    def canonical(self):
+        """Canonical name of every row."""
+        return self.ids.map(self.names)
+
+
+def resolve_names(names, threshold=0.7):
+    """Resolve ``names`` to canonical restaurant ids (see the module docstring).
+
+    Two normalized names are linked when their character-trigram Jaccard
+    similarity is at least ``threshold``. Missing names get a missing id.
+    """
+    names = pd.Series(names)
+    spellings = names.value_counts(sort=False)
+    spellings = spellings[spellings > 0]
+    key_of_spelling, keys = pd.factorize(normalize_names(spellings.index.to_series()))
+    keys = keys.to_numpy(dtype=str)
+
+    component = np.arange(len(keys))
+    if len(keys) > 1:
+        trigrams = {}
+        matched = []
+        for left, right in _candidate_pairs(_signatures(keys)):
+            # Candidates are few; each is checked once against exact trigram sets.
+            if left not in trigrams:
+                trigrams[left] = _trigrams(keys[left])
+            if right not in trigrams:
+                trigrams[right] = _trigrams(keys[right])
+            a, b = trigrams[left], trigrams[right]
+            if len(a & b) >= threshold * len(a | b):
+                matched.append((left, right))
+        if matched:
+            left, right = np.array(matched).T
+            component = _components(len(keys), left, right)
+
+    # Dense ids in order of first appearance, each named after its most common spelling.
+    spelling_ids = pd.Series(pd.factorize(component[key_of_spelling])[0], index=spellings.index)
+    canonical = (pd.DataFrame({'id': spelling_ids.to_numpy(), 'count': spellings.to_numpy(),
+                               'name': spellings.index.astype(object)})
+                   .sort_values('count', ascending=False, kind='stable')
+                   .drop_duplicates('id').set_index('id')['name'].sort_index())
+
+    ids = names.map(spelling_ids).astype('Int64').rename('restaurant_id')
+    return NameResolution(ids=ids, names=canonical.rename('name'))
+
+
+def chain_table(df, resolution=None):
+    """Per-restaurant (chain) listings, distinct outlets, votes and mean rating, most voted first.
+
+    Rows describing the same outlet -- same canonical restaurant and the same
+    :data:`OUTLET_COLUMNS` values -- count once, so a restaurant listed under
+    several types neither inflates the outlet count nor the vote total.
+    """
+    resolution = resolution or resolve_names(df['name'])
+    listings = df[[column for column in OUTLET_COLUMNS if column in df]].assign(restaurant_id=resolution.ids)
+    listings = listings[listings['restaurant_id'].notna()]
+    outlets = listings.drop_duplicates()
+    by_chain = outlets.groupby('restaurant_id')
+    table = pd.DataFrame({
+        'name': resolution.names,
+        'listings': listings.groupby('restaurant_id').size(),
+        'outlets': by_chain.size(),
+        'votes': by_chain['votes'].sum(),
+        'rate': by_chain['rate'].mean().round(2),
+    })
+    table.index.name = 'restaurant_id'
+    return table.sort_values(['votes', 'outlets'], ascending=False, kind='stable')
@@ -0,0 +1,190 @@
+"""Embedded SQL backend for the dashboard aggregates.
+
+Instead of parsing the CSV into a pandas frame and grouping it in Python, the
+file is registered with DuckDB, an in-process analytical engine, and the
+cleaning (rating and cost parsing, Yes/No flags) and the
+(type, online_order, rate, cost) group table of :mod:`zomato.aggregates` run
+as one pushed-down query. Only small results come back into Python: the group
+table, ten preview rows, the per-column missing counts, the most voted
+restaurants and, for the name and price-point sketches, the few hundred most
+frequent values and one HyperLogLog register per hash bucket. Sidebar
+filters become a ``WHERE`` clause on the same query.
+
+The result is a :class:`~zomato.ingest.StreamingAggregator` like the one the
+chunked pandas path builds, so every statistic is derived by the same code
+and both backends agree exactly (``tests/test_engine.py``). The one exception
+is the distinct-count estimates: DuckDB fills the HyperLogLog registers with
+its own hash, so they agree within the sketch's error and must not be merged
+with pandas-built ones.
+
+DuckDB is optional (``pip install duckdb``); without it only the pandas
+backend is offered.
+"""
+
+import pandas as pd
+
+from zomato.aggregates import COST_COL, TYPE_COL, FrameSummary
+from zomato.index import RANGE_COLUMNS
+from zomato.ingest import DATA_PATH, StreamingAggregator
+from zomato.schema import SCHEMA, downcast_int
+from zomato.topk import ColumnSketch
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - duckdb is optional
+    duckdb = None
+
+ENGINES = ['pandas'] + (['duckdb'] if duckdb is not None else [])
+
+# Strings pandas.read_csv reads as missing by default; DuckDB must agree.
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+             '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# SQL equivalents of the conversions in zomato.schema.apply_schema.
+_CLEAN = {
+    'yes_no': "CASE {col} WHEN 'Yes' THEN TRUE WHEN 'No' THEN FALSE END",
+    'rating': "TRY_CAST(trim(split_part({col}, '/', 1)) AS DOUBLE)",
+    'count': "TRY_CAST({col} AS BIGINT)",
+    'cost': "TRY_CAST(trim(replace({col}, ',', '')) AS DOUBLE)",
+}
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _label(column):
+    return f"CASE WHEN {column} THEN 'Yes' WHEN NOT {column} THEN 'No' END"
+
+
+def _where(filters):
+    """``WHERE`` clause and parameters for filters in :meth:`FrameIndex.select` form."""
+    clauses, params = [], []
+    for column, condition in (filters or {}).items():
+        condition = list(condition)
+        if column in RANGE_COLUMNS:
+            clauses.append(f"{_quote(column)} BETWEEN ? AND ?")
+        elif condition:
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(condition))})")
+        else:
+            clauses.append("FALSE")
+        params.extend(condition)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def _register(con, path):
+    """Create the ``raw`` and ``clean`` views over the CSV at ``path``; return its columns."""
+    # Views can't take prepared parameters, so the path goes in as a literal.
+    nullstr = ', '.join(map(_literal, NA_VALUES))
+    con.execute(
+        "CREATE VIEW raw AS SELECT row_number() OVER () AS _row, * "
+        f"FROM read_csv({_literal(path)}, header = true, all_varchar = true, "
+        f"encoding = 'latin-1', nullstr = [{nullstr}])"
+    )
+    columns = [row[0] for row in con.execute("DESCRIBE raw").fetchall()][1:]
+    select = ['_row']
+    for column in columns:
+        kind = SCHEMA.get(column)
+        expression = _CLEAN[kind].format(col=_quote(column)) if kind in _CLEAN else _quote(column)
+        select.append(f"{expression} AS {_quote(column)}")
+        if kind == 'rating':
+            # Present but unparseable, like the count parse_rates reports.
+            select.append(f"{_quote(column)} IS NOT NULL AND {expression} IS NULL AS _rejected")
+    con.execute(f"CREATE VIEW clean AS SELECT {', '.join(select)} FROM raw")
+    return columns
+
+
+def _fetch(con, query, params=()):
+    return con.execute(query, params).fetchdf()
+
+
+def _sketch(con, column):
+    """:class:`~zomato.topk.ColumnSketch` of ``column`` of ``selected``, built from small SQL results."""
+    sketch = ColumnSketch()
+    capacity, width = sketch.heavy_hitters.capacity, 64 - sketch.distinct.precision
+    column = _quote(column)
+    # Misra-Gries over the full counts keeps only what beats the (capacity + 1)-th
+    # largest, so those rows and the total are all it needs.
+    total = con.execute(f"SELECT count({column}) FROM selected").fetchone()[0]
+    counts = _fetch(con, f"SELECT {column} AS value, count(*) AS n FROM selected WHERE {column} IS NOT NULL "
+                         f"GROUP BY ALL ORDER BY n DESC, min(_row) LIMIT {capacity + 1}")
+    if column == _quote(COST_COL):
+        counts['value'] = downcast_int(counts['value'])
+    sketch.heavy_hitters.update_counts(counts.set_index('value')['n'], total=total)
+    # HyperLogLog registers: max rank per hash bucket, at most 2**precision rows.
+    # Rank is the leading zeros of the remaining bits plus one; floor(log2) on a
+    # double can round 2**k - 1 up to k, which at worst nudges one register.
+    registers = _fetch(con, f"""
+        SELECT bucket, max(CASE WHEN rest = 0 THEN {width + 1}
+                                ELSE {width} - CAST(floor(log2(rest)) AS INTEGER) END) AS rank
+        FROM (SELECT hash({column}) >> {width} AS bucket,
+                     hash({column}) & {(1 << width) - 1}::UBIGINT AS rest
+              FROM selected WHERE {column} IS NOT NULL)
+        GROUP BY bucket
+    """)
+    sketch.distinct.update_registers(registers['bucket'], registers['rank'])
+    return sketch
+
+
+def sql_aggregates(path=DATA_PATH, filters=None):
+    """Aggregate ``path`` inside DuckDB; return a :class:`~zomato.ingest.StreamingAggregator`.
+
+    ``filters`` uses the :meth:`~zomato.index.FrameIndex.select` format and
+    restricts every aggregate to the matching rows.
+    """
+    if duckdb is None:
+        raise RuntimeError("the SQL engine needs duckdb (pip install duckdb)")
+    con = duckdb.connect()
+    try:
+        columns = _register(con, path)
+        where, params = _where(filters)
+        con.execute(f"CREATE TEMP TABLE selected AS SELECT * FROM clean {where}", params)
+
+        rows, rejected = con.execute("SELECT count(*), count(*) FILTER (WHERE _rejected) FROM selected").fetchone()
+
+        # Groups come back in order of first appearance, like groupby(sort=False).
+        type_col, cost_col = _quote(TYPE_COL), _quote(COST_COL)
+        groups = _fetch(con, f"""
+            SELECT {type_col}, {_label('online_order')} AS online_order, rate, {cost_col},
+                   count(*) AS restaurants, CAST(sum(votes) AS BIGINT) AS votes
+            FROM selected
+            GROUP BY ALL
+            ORDER BY min(_row)
+        """)
+        groups[COST_COL] = downcast_int(groups[COST_COL])
+
+        missing = con.execute(
+            "SELECT " + ', '.join(f"count(*) - count({_quote(column)})" for column in columns) + " FROM selected"
+        ).fetchone()
+        preview = _fetch(con, f"SELECT * EXCLUDE (_row, _rejected) FROM selected ORDER BY _row LIMIT {FrameSummary.PREVIEW_ROWS}")
+        preview[COST_COL] = downcast_int(preview[COST_COL])
+        # Every row tied with the TOP_VOTED-th highest vote count, in row order.
+        top_voted = _fetch(con, f"""
+            SELECT name, votes, rate FROM selected
+            WHERE votes >= coalesce((SELECT votes FROM selected WHERE votes IS NOT NULL
+                                     ORDER BY votes DESC LIMIT 1 OFFSET {FrameSummary.TOP_VOTED - 1}),
+                                    (SELECT min(votes) FROM selected))
+            ORDER BY votes DESC, _row
+        """)
+        sketches = {column: _sketch(con, column) for column in ('name', COST_COL)}
+    finally:
+        con.close()
+
+    aggregator = StreamingAggregator()
+    aggregator.rows = int(rows)
+    aggregator.rejected_rates = int(rejected)
+    aggregator.groups = groups
+    aggregator.summary = FrameSummary(
+        columns=columns,
+        preview=preview,
+        missing=pd.Series(missing, index=columns, dtype='int64'),
+        champion=FrameSummary.champion_of(top_voted),
+        top_voted=top_voted,
+        names=sketches['name'],
+        costs=sketches[COST_COL],
+    )
+    return aggregator
@@ -0,0 +1,186 @@
+"""Incremental append mode.
+
+The restaurant feed grows by appending rows to the CSV. Instead of
+re-aggregating the whole history, a checkpoint keeps the running state --
+the :class:`~zomato.ingest.StreamingAggregator` (a mergeable group table of
+counts and vote sums) and the byte offset of the last row folded in -- and
+each update only parses the bytes appended since then. Update cost scales
+with the size of the delta, not the file.
+
+Medians and percentiles come from the same group table: it records the full
+rating and cost distributions, which works as an exact mergeable quantile
+sketch here because both columns take a small set of values (ratings to one
+decimal, costs in round amounts). Incremental results therefore equal a full
+recompute exactly; the sketch error is zero.
+
+A final row without its newline is counted in the results but kept out of
+the checkpoint, whose offset stays at the last newline: the next update
+parses that row again, as it was or as a writer has since completed it.
+
+If the file was rewritten rather than appended to (it shrank, or the bytes
+just before the checkpoint changed), or the checkpoint can't be read, it is
+discarded and the file is aggregated from scratch.
+"""
+
+import copy
+import hashlib
+import io
+import logging
+import os
+
+import pandas as pd
+
+from zomato.cache import CACHE_DIR, _write_atomic, source_key
+from zomato.ingest import DATA_PATH, DEFAULT_CHUNKSIZE, ENCODING, StreamingAggregator
+
+# Bytes before the checkpoint offset that must be unchanged for an append.
+TAIL_CHECK_BYTES = 64 * 1024
+# Bumped when the pickled aggregator changes shape; older checkpoints are rebuilt.
+CHECKPOINT_FORMAT = 4
+
+logger = logging.getLogger(__name__)
+
+
+class _BoundedReader(io.RawIOBase):
+    """Read-only view of ``f`` from its current position up to ``end``."""
+
+    def __init__(self, f, end):
+        self._f = f
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        remaining = self._end - self._f.tell()
+        if remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:remaining]
+        return self._f.readinto(view)
+
+
+def _tail_hash(f, offset):
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _complete_end(f, size):
+    """Offset just past the last newline: a half-written final row waits for the next update."""
+    position = size
+    while position > 0:
+        start = max(0, position - 64 * 1024)
+        f.seek(start)
+        block = f.read(position - start)
+        newline = block.rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+class IncrementalAggregator:
+    """Dashboard aggregates of ``path`` kept up to date from a checkpoint."""
+
+    def __init__(self, path=DATA_PATH, checkpoint_path=None, chunksize=DEFAULT_CHUNKSIZE):
+        self.path = path
+        if checkpoint_path is None:
+            checkpoint_path = os.path.join(CACHE_DIR, f"{source_key(path)}.incremental.pkl")
+        self.checkpoint_path = checkpoint_path
+        self.chunksize = chunksize
+        self.state = self._load_checkpoint()
+        # The checkpointed aggregator plus any final row still missing its newline.
+        self.aggregator = self.state['aggregator'] if self.state else None
+
+    def _load_checkpoint(self):
+        try:
+            state = pd.read_pickle(self.checkpoint_path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            # Truncated, corrupt or written by an incompatible version: rebuild.
+            logger.warning("discarding unreadable checkpoint %s: %s", self.checkpoint_path, exc)
+            return None
+        if not isinstance(state, dict) or state.get('format') != CHECKPOINT_FORMAT:
+            return None
+        return state
+
+    def _save_checkpoint(self):
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _write_atomic(self.checkpoint_path, lambda tmp: pd.to_pickle(self.state, tmp))
+
+    def _is_append(self, f, size):
+        state = self.state
+        return (state is not None and state['offset'] <= size
+                and _tail_hash(f, state['offset']) == state['tail_hash'])
+
+    def _fold(self, aggregator, f, start, end, columns):
+        if start >= end:
+            return 0
+        f.seek(start)
+        text = io.TextIOWrapper(io.BufferedReader(_BoundedReader(f, end)), encoding=ENCODING)
+        rows = 0
+        with pd.read_csv(text, header=None, names=columns, chunksize=self.chunksize) as reader:
+            for chunk in reader:
+                aggregator.update(chunk)
+                rows += len(chunk)
+        return rows
+
+    def update(self):
+        """Fold in rows appended since the last update; return how many were added."""
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            end = _complete_end(f, size)
+            appending = self._is_append(f, size)
+            if appending:
+                state = self.state
+                start, columns, aggregator = state['offset'], state['columns'], state['aggregator']
+            else:
+                f.seek(0)
+                header = f.readline()
+                start = len(header)
+                columns = pd.read_csv(io.BytesIO(header), encoding=ENCODING, nrows=0).columns.tolist()
+                aggregator = StreamingAggregator()
+            previous_tail = self.state['tail_rows'] if appending else 0
+            added = self._fold(aggregator, f, start, end, columns)
+            offset = max(start, end)
+            tail = StreamingAggregator()
+            tail_rows = self._fold(tail, f, offset, size, columns)
+            if added or not appending or tail_rows != previous_tail:
+                self.state = {
+                    'format': CHECKPOINT_FORMAT,
+                    'offset': offset,
+                    'tail_hash': _tail_hash(f, offset),
+                    'tail_rows': tail_rows,
+                    'columns': columns,
+                    'aggregator': aggregator,
+                }
+                self._save_checkpoint()
+        # merge() rebinds rather than mutates, so a shallow copy leaves the checkpoint alone.
+        self.aggregator = copy.copy(aggregator).merge(tail) if tail_rows else aggregator
+        return added + tail_rows - previous_tail
+
+    @property
+    def rows(self):
+        return self.aggregator.rows if self.aggregator else 0
+
+    @property
+    def rejected_rates(self):
+        return self.aggregator.rejected_rates if self.aggregator else 0
+
+    @property
+    def summary(self):
+        return self.aggregator.summary if self.aggregator else None
+
+    def stats(self):
+        """:class:`~zomato.aggregates.DashboardStats` as of the last :meth:`update`."""
+        return self.aggregator.stats()
+
+
+def update_aggregates(path=DATA_PATH, checkpoint_path=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Bring the checkpoint for ``path`` up to date; return ``(stats, rows_added)``."""
+    aggregator = IncrementalAggregator(path, checkpoint_path, chunksize)
+    added = aggregator.update()
+    return aggregator.stats(), added
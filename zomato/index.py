@@ -0,0 +1,103 @@
+"""Row indexes for interactive filtering.
+
+Built once per dataset version, a :class:`FrameIndex` keeps, for each
+categorical/boolean column, the sorted row ids of every value (a posting
+list), and for each numeric column the row ids ordered by value. A filter
+then never compares a whole column: the match count of each filter is known
+from posting-list lengths or two binary searches, only the smallest match set
+is built, and its ids are checked against every other filter -- binary
+searches into the sorted posting lists, or a lookup of the row's value for
+ranges. The large match sets are never merged or sorted, so the work follows
+the size of the smallest filter's matches rather than the size of the frame.
+"""
+
+import numpy as np
+
+CATEGORY_COLUMNS = ['listed_in(type)', 'online_order', 'book_table']
+RANGE_COLUMNS = ['rate', 'approx_cost(for two people)']
+
+
+class FrameIndex:
+    """Posting lists and sorted orders over one frame's rows."""
+
+    def __init__(self, df, category_columns=CATEGORY_COLUMNS, range_columns=RANGE_COLUMNS):
+        self.rows = len(df)
+        self.postings = {}
+        for column in category_columns:
+            if column in df:
+                groups = df.groupby(column, observed=True, sort=False).indices
+                self.postings[column] = {value: ids.astype(np.int64) for value, ids in groups.items()}
+        self.orders = {}
+        self.values = {}
+        for column in range_columns:
+            if column in df:
+                values = df[column].to_numpy(dtype=float)
+                # NaNs sort last and never fall inside a [low, high] range.
+                order = np.argsort(values, kind='stable')
+                self.orders[column] = (values[order], order.astype(np.int64))
+                self.values[column] = values
+
+    def lookup(self, column, values):
+        """Sorted row ids whose ``column`` is any of ``values``."""
+        postings = self.postings[column]
+        parts = [postings[value] for value in values if value in postings]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def range(self, column, low, high):
+        """Sorted row ids with ``low <= column <= high``."""
+        sorted_values, order = self.orders[column]
+        start = np.searchsorted(sorted_values, low, side='left')
+        stop = np.searchsorted(sorted_values, high, side='right')
+        return np.sort(order[start:stop])
+
+    def count(self, column, condition):
+        """How many rows one filter matches, without building their ids."""
+        if column in self.orders:
+            sorted_values, _ = self.orders[column]
+            low, high = condition
+            return int(np.searchsorted(sorted_values, high, side='right') -
+                       np.searchsorted(sorted_values, low, side='left'))
+        postings = self.postings[column]
+        return sum(len(postings[value]) for value in condition if value in postings)
+
+    def contains(self, column, condition, ids):
+        """Mask of the sorted row ``ids`` that one filter matches."""
+        if column in self.orders:
+            low, high = condition
+            values = self.values[column][ids]
+            return (values >= low) & (values <= high)
+        postings = self.postings[column]
+        mask = np.zeros(len(ids), dtype=bool)
+        for value in condition:
+            if value not in postings:
+                continue
+            posting = postings[value]
+            positions = np.searchsorted(posting, ids).clip(max=len(posting) - 1)
+            mask |= posting[positions] == ids
+        return mask
+
+    def select(self, filters):
+        """Row ids matching every filter, sorted.
+
+        ``filters`` maps a column to either a collection of accepted values
+        (category columns) or a ``(low, high)`` tuple (range columns). Returns
+        None when there is nothing to filter on.
+
+        Only the smallest filter's matches are built; the others are checked
+        id by id with binary searches, in O(smallest * log(rows)).
+        """
+        if not filters:
+            return None
+        columns = sorted(filters, key=lambda column: self.count(column, filters[column]))
+        first = columns[0]
+        if first in self.orders:
+            rows = self.range(first, *filters[first])
+        else:
+            rows = self.lookup(first, filters[first])
+        for column in columns[1:]:
+            if not len(rows):
+                break
+            rows = rows[self.contains(column, filters[column], rows)]
+        return rows
@@ -0,0 +1,74 @@
+"""Chunked CSV ingestion.
+
+Reads the Zomato export in bounded-size chunks and folds each chunk into a
+running group table (see :mod:`zomato.aggregates`), so peak memory depends on
+the chunk size and not on the size of the file. Because group tables merge
+exactly, the finished statistics are identical to the in-memory path.
+"""
+
+import pandas as pd
+
+from zomato.aggregates import DashboardStats, FrameSummary, group_table, merge_group_tables
+from zomato.schema import apply_schema
+
+DATA_PATH = "Zomato-data-.csv"
+ENCODING = "latin-1"
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def iter_chunks(path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the CSV as DataFrames of at most ``chunksize`` rows."""
+    with pd.read_csv(path, encoding=ENCODING, chunksize=chunksize) as reader:
+        yield from reader
+
+
+class StreamingAggregator:
+    """Running dashboard aggregates, updated one chunk at a time.
+
+    The state kept here is a group table, bounded by the number of distinct
+    (type, online_order, rate, cost) combinations, never by the number of rows,
+    plus a :class:`~zomato.aggregates.FrameSummary` of the row-level views.
+    Aggregators of disjoint slices combine with :meth:`merge`.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.rejected_rates = 0
+        self.groups = None
+        self.summary = None
+
+    def update(self, chunk):
+        chunk, report = apply_schema(chunk, measure_memory=False)
+        return self.update_clean(chunk, report['rejected_rates'])
+
+    def update_clean(self, chunk, rejected_rates=0):
+        """Fold in a chunk that already went through :func:`~zomato.schema.apply_schema`."""
+        self.rows += len(chunk)
+        self.rejected_rates += rejected_rates
+        partial = group_table(chunk)
+        self.groups = partial if self.groups is None else merge_group_tables([self.groups, partial])
+        summary = FrameSummary.from_frame(chunk)
+        self.summary = summary if self.summary is None else self.summary.merge(summary)
+        return self
+
+    def merge(self, other):
+        """Fold in the aggregator of a slice that comes after this one."""
+        if other.groups is None:
+            return self
+        self.rows += other.rows
+        self.rejected_rates += other.rejected_rates
+        self.groups = other.groups if self.groups is None else merge_group_tables([self.groups, other.groups])
+        self.summary = other.summary if self.summary is None else self.summary.merge(other.summary)
+        return self
+
+    def stats(self):
+        """:class:`~zomato.aggregates.DashboardStats` of every row seen so far."""
+        return DashboardStats.from_groups(self.groups)
+
+
+def stream_aggregates(path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Build a :class:`StreamingAggregator` over the whole file, chunk by chunk."""
+    aggregator = StreamingAggregator()
+    for chunk in iter_chunks(path, chunksize):
+        aggregator.update(chunk)
+    return aggregator
@@ -0,0 +1,106 @@
+"""Plotly versions of the dashboard figures, rendered in the browser.
+
+Builders mirror :mod:`zomato.charts` name for name, so a
+:class:`~zomato.render.ChartSpec` can be drawn by either backend. They read
+the same precomputed :class:`~zomato.aggregates.DashboardStats` and only put
+the small aggregated series -- counts per type, histogram bins, box
+statistics, the pivot matrix -- into the figure, so the server never
+rasterizes anything and the page ships a few kilobytes of JSON per chart
+instead of a PNG. The charts are zoomable and show values on hover.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+
+ONLINE_COLORS = {'Yes': '#4CAF50', 'No': '#FF5252'}
+
+
+def _layout(fig, title, xaxis, yaxis, height=450):
+    fig.update_layout(title={'text': f"<b>{title}</b>"}, xaxis_title=f"<b>{xaxis}</b>",
+                      yaxis_title=f"<b>{yaxis}</b>", height=height, margin={'t': 60})
+    return fig
+
+
+def _palette(scale, n):
+    return sample_colorscale(scale, list(np.linspace(0, 1, n)))
+
+
+def type_counts_bar(stats):
+    type_counts = stats.type_counts
+    fig = go.Figure(go.Bar(x=type_counts.index.astype(str), y=type_counts.values,
+                           marker_color=_palette('HSV', len(type_counts) + 1)[:len(type_counts)]))
+    return _layout(fig, 'Count of Restaurants by Type', 'Restaurant Type', 'Number of Restaurants')
+
+
+def type_votes_line(stats):
+    grouped_data = stats.type_votes
+    fig = go.Figure(go.Scatter(x=grouped_data.index.astype(str), y=grouped_data.values, mode='lines+markers',
+                               line={'color': '#e23744', 'width': 3}, marker={'size': 10}))
+    return _layout(fig, 'Customer Engagement by Restaurant Type', 'Restaurant Type', 'Total Votes')
+
+
+def online_pie(stats):
+    online_counts = stats.online_counts
+    fig = go.Figure(go.Pie(labels=online_counts.index, values=online_counts.values, sort=False,
+                           marker_colors=[ONLINE_COLORS.get(label) for label in online_counts.index],
+                           textinfo='label+percent', direction='counterclockwise', rotation=90))
+    fig.update_layout(title={'text': '<b>Online Order Availability</b>'}, height=450, margin={'t': 60})
+    return fig
+
+
+def online_count_bar(stats):
+    online_counts = stats.online_counts.reindex(['Yes', 'No'], fill_value=0)
+    fig = go.Figure(go.Bar(x=online_counts.index, y=online_counts.values,
+                           marker_color=[ONLINE_COLORS[label] for label in online_counts.index]))
+    return _layout(fig, 'Restaurant Count by Online Order Availability', 'Online Order Available',
+                   'Number of Restaurants')
+
+
+def rating_histogram(stats):
+    hist_counts, hist_edges = stats.rate_histogram(bins=20)
+    fig = go.Figure(go.Bar(x=(hist_edges[:-1] + hist_edges[1:]) / 2, y=hist_counts, width=np.diff(hist_edges),
+                           marker={'color': _palette('RdYlGn', len(hist_counts)), 'line': {'color': 'black', 'width': 1}},
+                           opacity=0.7, name='Restaurants',
+                           customdata=np.column_stack([hist_edges[:-1], hist_edges[1:]]),
+                           hovertemplate='%{customdata[0]:.2f}-%{customdata[1]:.2f}: %{y}<extra></extra>'))
+    fig.add_vline(x=stats.rate_mean, line={'color': 'red', 'dash': 'dash', 'width': 2},
+                  annotation_text=f"Average: {stats.rate_mean:.2f}")
+    return _layout(fig, 'Distribution of Restaurant Ratings', 'Rating', 'Number of Restaurants')
+
+
+def cost_top20_bar(stats):
+    top_costs = stats.cost_counts.nlargest(20)
+    fig = go.Figure(go.Bar(x=top_costs.index.astype(str), y=top_costs.values,
+                           marker_color=_palette('Viridis', len(top_costs))))
+    fig.update_xaxes(type='category')
+    return _layout(fig, 'Top 20 Most Common Price Points', 'Approximate Cost for Two People',
+                   'Number of Restaurants')
+
+
+def online_rating_boxplot(stats):
+    # Boxes come straight from the precomputed quartiles and whiskers; the
+    # capped outlier sample is overlaid as markers.
+    fig = go.Figure()
+    for box in stats.rate_box_stats(order=('Yes', 'No')):
+        label = box['label']
+        fig.add_trace(go.Box(x=[label], q1=[box['q1']], median=[box['med']], q3=[box['q3']],
+                             lowerfence=[box['whislo']], upperfence=[box['whishi']], mean=[box['mean']],
+                             name=label, fillcolor=ONLINE_COLORS[label], line={'color': 'black'},
+                             showlegend=False))
+        if len(box['fliers']):
+            fig.add_trace(go.Scatter(x=[label] * len(box['fliers']), y=box['fliers'], mode='markers',
+                                     marker={'symbol': 'circle-open', 'color': '#3d3d3d'},
+                                     name=f"{label} outliers", showlegend=False))
+    return _layout(fig, 'Rating Distribution: Online vs Offline Orders', 'Online Order Available', 'Rating',
+                   height=500)
+
+
+def type_online_heatmap(stats):
+    pivot = stats.online_pivot
+    fig = go.Figure(go.Heatmap(z=pivot.values, x=pivot.columns.astype(str), y=pivot.index.astype(str),
+                               colorscale='YlOrRd', texttemplate='%{z}', xgap=1, ygap=1,
+                               colorbar={'title': {'text': 'Number of Restaurants'}}))
+    fig.update_yaxes(autorange='reversed')
+    return _layout(fig, 'Restaurant Type vs Online Order Availability', 'Online Order Available',
+                   'Restaurant Type', height=550)
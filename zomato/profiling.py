@@ -0,0 +1,192 @@
+"""Per-stage timing and memory profiling.
+
+Code marks what it is doing with :func:`stage` (a context manager, nestable)
+or :func:`section` (a flat marker that ends the previous section, for
+straight-line scripts like the dashboard). Both are no-ops -- one context
+variable lookup -- unless a :class:`Profiler` has been started in the
+current context, so the markers stay in place permanently.
+
+A running profiler records, for every stage, wall time, CPU time of the
+calling thread and the peak memory allocated above the level at which the
+stage started (traced with :mod:`tracemalloc`, which only runs while some
+profiler is active). Work done in other processes, such as the figure
+render pool, is counted as the wall time spent waiting for it. tracemalloc is
+process-wide: allocations of other threads count too, and each stage resets
+the process-wide peak, so when several sessions of one server are profiled
+at the same time their peak memory figures disturb each other. Wall and CPU
+times are per thread and unaffected.
+
+Records export as JSON lines (:meth:`Profiler.to_jsonl`) or as a Chrome
+trace (:meth:`Profiler.to_trace`) that opens in ``chrome://tracing`` or
+https://ui.perfetto.dev.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+_active = contextvars.ContextVar('zomato_profiler', default=None)
+_NULL_STAGE = contextlib.nullcontext()
+
+# tracemalloc is process-wide; it runs while at least one profiler does.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _start_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+def stage(name):
+    """Context manager recording ``name`` in the active profiler, if any."""
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name)
+
+
+def section(name):
+    """End the current section of the active profiler, if any, and start ``name``."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.section(name)
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'wall', 'cpu', 'memory', 'peak')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self)
+        return False
+
+
+class Profiler:
+    """Collects stage records for one run; :meth:`start` it, then :meth:`stop` it."""
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._section = None
+        self._token = None
+        self._origin = None
+
+    def start(self):
+        _start_tracing()
+        self._origin = time.perf_counter()
+        self._token = _active.set(self)
+        return self
+
+    def stop(self):
+        """Close any open section and deactivate; safe to call more than once."""
+        if self._token is None:
+            return self
+        while self._stack:
+            self._exit(self._stack[-1])
+        self._section = None
+        _active.reset(self._token)
+        self._token = None
+        _stop_tracing()
+        return self
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def section(self, name):
+        if self._section is not None:
+            self._exit(self._section)
+        self._section = _Stage(self, name)
+        self._enter(self._section)
+
+    def _enter(self, entry):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # reset_peak() below would lose the enclosing stage's peak so far.
+            self._stack[-1].peak = max(self._stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        entry.memory = entry.peak = current
+        entry.wall = time.perf_counter()
+        entry.cpu = time.thread_time()
+        self._stack.append(entry)
+
+    def _exit(self, entry):
+        if entry not in self._stack:
+            return
+        cpu = time.thread_time() - entry.cpu
+        end = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        # Inner stages may still be open when a section ends; close them first.
+        while self._stack and self._stack[-1] is not entry:
+            self._exit(self._stack[-1])
+        self._stack.pop()
+        entry.peak = max(entry.peak, peak)
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, entry.peak)
+        if entry is self._section:
+            self._section = None
+        self.records.append({
+            'stage': ' / '.join([parent.name for parent in self._stack] + [entry.name]),
+            'depth': len(self._stack),
+            'start': entry.wall - self._origin,
+            'wall': end - entry.wall,
+            'cpu': cpu,
+            'peak_bytes': max(0, entry.peak - entry.memory),
+        })
+
+    def table(self):
+        """Records as a DataFrame in start order, times in milliseconds and memory in KiB."""
+        records = sorted(self.records, key=lambda record: record['start'])
+        table = pd.DataFrame(records, columns=['stage', 'depth', 'start', 'wall', 'cpu', 'peak_bytes'])
+        return pd.DataFrame({
+            'Stage': [('  ' * (depth - 1) + '↳ ' if depth else '') + name.rsplit(' / ', 1)[-1]
+                      for name, depth in zip(table['stage'], table['depth'])],
+            'Wall (ms)': (table['wall'] * 1000).round(1),
+            'CPU (ms)': (table['cpu'] * 1000).round(1),
+            'Peak (KiB)': (table['peak_bytes'] / 1024).round(1),
+        })
+
+    def to_jsonl(self):
+        """One JSON object per stage, in start order."""
+        records = sorted(self.records, key=lambda record: record['start'])
+        return ''.join(json.dumps(record) + '\n' for record in records)
+
+    def to_trace(self):
+        """Chrome trace-event JSON of every stage."""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{
+            'name': record['stage'].rsplit(' / ', 1)[-1],
+            'cat': 'zomato',
+            'ph': 'X',
+            'ts': round(record['start'] * 1e6, 1),
+            'dur': round(record['wall'] * 1e6, 1),
+            'pid': pid,
+            'tid': tid,
+            'args': {'stage': record['stage'], 'cpu_ms': round(record['cpu'] * 1000, 3),
+                     'peak_kib': round(record['peak_bytes'] / 1024, 1)},
+        } for record in self.records]
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
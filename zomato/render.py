@@ -0,0 +1,99 @@
+"""Concurrent figure rendering.
+
+Each dashboard chart is described by a :class:`ChartSpec`: the name of a
+builder in :mod:`zomato.charts` plus the precomputed data it draws. Specs are
+plain picklable data, so they can be rendered in a pool of worker processes,
+side-stepping the GIL for the CPU-bound Matplotlib work. Results always come
+back in spec order, and rendering falls back to the same serial loop when
+only one worker is requested or the pool cannot be used. The same specs can
+instead be built as Plotly figures (:func:`build_interactive`), which the
+browser draws from the aggregated data.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pickle import PicklingError
+
+from zomato import charts, plotly_charts
+from zomato.profiling import stage
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """A chart to render: ``charts.<builder>(*args)`` saved as ``fmt``."""
+
+    name: str
+    builder: str
+    args: tuple = field(default=())
+    fmt: str = 'png'
+
+
+def chart_specs(stats, fmt='png'):
+    """Specs for every figure on the dashboard, in page order."""
+    return [
+        ChartSpec('type_counts', 'type_counts_bar', (stats,), fmt),
+        ChartSpec('type_votes', 'type_votes_line', (stats,), fmt),
+        ChartSpec('online_pie', 'online_pie', (stats,), fmt),
+        ChartSpec('online_counts', 'online_count_bar', (stats,), fmt),
+        ChartSpec('rating_histogram', 'rating_histogram', (stats,), fmt),
+        ChartSpec('cost_top20', 'cost_top20_bar', (stats,), fmt),
+        ChartSpec('online_rating_boxplot', 'online_rating_boxplot', (stats,), fmt),
+        ChartSpec('type_online_heatmap', 'type_online_heatmap', (stats,), fmt),
+    ]
+
+
+def render_spec(spec):
+    """Build and serialize one chart. Runs in worker processes."""
+    fig = getattr(charts, spec.builder)(*spec.args)
+    return charts.render_image(fig, spec.fmt)
+
+
+def build_interactive(spec):
+    """The Plotly version of ``spec``, drawn client-side instead of rendered here."""
+    return getattr(plotly_charts, spec.builder)(*spec.args)
+
+
+def render_serial(specs):
+    images = {}
+    for spec in specs:
+        with stage(f"render {spec.name}"):
+            images[spec.name] = render_spec(spec)
+    return images
+
+
+class FigureRenderer:
+    """Renders chart specs, in parallel when ``workers`` > 1.
+
+    The worker pool is started lazily and reused across calls; it uses the
+    ``spawn`` start method because the Streamlit server is multi-threaded.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def render(self, specs):
+        """Return ``{spec.name: image bytes}`` in spec order."""
+        specs = list(specs)
+        if self.workers <= 1 or len(specs) <= 1:
+            return render_serial(specs)
+        try:
+            images = list(self._get_pool().map(render_spec, specs))
+        except (BrokenProcessPool, PicklingError, OSError):
+            self.close()
+            return render_serial(specs)
+        return {spec.name: image for spec, image in zip(specs, images)}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
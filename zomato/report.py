@@ -0,0 +1,136 @@
+"""Headless batch reports: ``zomato-report``.
+
+Runs the dashboard pipeline without Streamlit over one or many CSV exports
+(one per city, say) and writes, for each input, the rendered figures and a
+``metrics.json`` with every statistic the dashboard shows::
+
+    zomato-report exports/*.csv --out reports --jobs 8
+
+Each file is streamed in bounded-size chunks (see :mod:`zomato.ingest`), and
+files are processed in parallel, one per worker process. With
+``--incremental`` a checkpoint is kept next to each report so the next run
+only folds in rows appended since (see :mod:`zomato.incremental`), and with
+``--engine duckdb`` each file is aggregated inside DuckDB (see
+:mod:`zomato.engine`). An export with no rows gets its metrics but no
+figures, and a file that fails is reported without stopping the others.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from zomato.dataset import city_name, expand_inputs
+from zomato.engine import ENGINES, sql_aggregates
+from zomato.incremental import IncrementalAggregator
+from zomato.ingest import DEFAULT_CHUNKSIZE, stream_aggregates
+from zomato.render import chart_specs, render_serial
+
+
+def build_report(path, out_dir, fmt='png', chunksize=DEFAULT_CHUNKSIZE, incremental=False, engine='pandas'):
+    """Aggregate ``path``, write its figures and metrics under ``out_dir``; return the metrics."""
+    start = time.perf_counter()
+    report_dir = os.path.join(out_dir, city_name(path))
+    os.makedirs(report_dir, exist_ok=True)
+
+    if incremental:
+        aggregator = IncrementalAggregator(path, os.path.join(report_dir, 'checkpoint.pkl'), chunksize)
+        rows_added = aggregator.update()
+    elif engine == 'duckdb':
+        aggregator = sql_aggregates(path)
+        rows_added = aggregator.rows
+    else:
+        aggregator = stream_aggregates(path, chunksize)
+        rows_added = aggregator.rows
+    stats = aggregator.stats()
+
+    # Nothing to plot in an empty export (a pie of zero wedges doesn't even draw).
+    figures = render_serial(chart_specs(stats, fmt=fmt)) if stats.total_rows else {}
+    for name, image in figures.items():
+        with open(os.path.join(report_dir, f"{name}.{fmt}"), 'wb') as f:
+            f.write(image)
+
+    metrics = {
+        'source': os.path.abspath(path),
+        'rejected_rates': aggregator.rejected_rates,
+        'rows_added': rows_added,
+        **stats.to_dict(),
+        'restaurants': aggregator.summary.to_dict() if aggregator.summary else {},
+        'figures': sorted(f"{name}.{fmt}" for name in figures),
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+    }
+    with open(os.path.join(report_dir, 'metrics.json'), 'w') as f:
+        json.dump(metrics, f, indent=2, allow_nan=False)
+    return metrics
+
+
+def run(paths, out_dir, jobs=1, fmt='png', chunksize=DEFAULT_CHUNKSIZE, incremental=False, engine='pandas'):
+    """Build reports for ``paths``, ``jobs`` files at a time.
+
+    Returns ``({path: metrics}, {path: exception})``: one file failing doesn't
+    stop the others.
+    """
+    results, failures = {}, {}
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                results[path] = build_report(path, out_dir, fmt, chunksize, incremental, engine)
+            except Exception as exc:
+                failures[path] = exc
+        return results, failures
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        futures = {pool.submit(build_report, path, out_dir, fmt, chunksize, incremental, engine): path
+                   for path in paths}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as exc:
+                failures[futures[future]] = exc
+    # Report in input order, not completion order.
+    return ({path: results[path] for path in paths if path in results},
+            {path: failures[path] for path in paths if path in failures})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='zomato-report', description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="CSV files, directories or glob patterns")
+    parser.add_argument('-o', '--out', default='reports', help="output directory (default: reports)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="files processed in parallel (default: CPU count)")
+    parser.add_argument('--format', default='png', choices=['png', 'svg'], help="figure format")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="rows per CSV chunk")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only fold in rows appended since the previous run's checkpoint")
+    parser.add_argument('--engine', default='pandas', choices=ENGINES,
+                        help="aggregation backend (duckdb needs the duckdb package)")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"no such file: {', '.join(missing)}")
+    if not paths:
+        parser.error("no CSV files matched")
+    if args.incremental and args.engine != 'pandas':
+        parser.error("--incremental only works with the pandas engine")
+
+    start = time.perf_counter()
+    results, failures = run(paths, args.out, jobs=args.jobs, fmt=args.format, chunksize=args.chunksize,
+                            incremental=args.incremental, engine=args.engine)
+    for path, metrics in results.items():
+        print(f"{path}: {metrics['total_rows']:,} rows ({metrics['rows_added']:,} new) "
+              f"in {metrics['elapsed_seconds']:.2f}s")
+    for path, exc in failures.items():
+        message = str(exc).splitlines()[0] if str(exc) else ''
+        print(f"{path}: failed: {type(exc).__name__}: {message}", file=sys.stderr)
+    print(f"{len(results)} report(s) written to {args.out} in {time.perf_counter() - start:.2f}s"
+          + (f", {len(failures)} failed" if failures else ""))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
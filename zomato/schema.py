@@ -0,0 +1,204 @@
+"""Explicit dtype schema for the restaurant frame.
+
+Read as plain CSV, every text column is a Python-object string and every
+number an int64. Applying the schema at load time turns the Yes/No flags into
+booleans, low-cardinality text into categoricals, parses cost strings such as
+"1,200", and downcasts the integer columns, which cuts the in-memory size of
+the frame several times over.
+
+Those dtypes depend on the values seen, so chunks cleaned one at a time can
+disagree; :class:`ChunkedSchema` works out the dtypes of the whole file from
+its cleaned chunks and conforms each chunk to them.
+"""
+
+import pandas as pd
+
+from zomato.cleaning import parse_rates
+
+YES_NO = {True: 'Yes', False: 'No'}
+
+SCHEMA = {
+    'name': 'text',
+    'online_order': 'yes_no',
+    'book_table': 'yes_no',
+    'rate': 'rating',
+    'votes': 'count',
+    'approx_cost(for two people)': 'cost',
+    'listed_in(type)': 'category',
+}
+
+# Text columns become categoricals when at most this share of values is unique.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def parse_cost(values):
+    """Parse costs such as ``1,200`` into numbers; unparseable values become NaN."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    return pd.to_numeric(values.astype(str).str.replace(',', '', regex=False).str.strip(),
+                         errors='coerce')
+
+
+def downcast_int(values):
+    """Smallest integer dtype that holds ``values``, or float64 when there are gaps.
+
+    float32 would be smaller but only holds integers up to 2**24 exactly, so
+    vote totals summed in it drift once the export has a few million rows.
+    """
+    if values.isna().any():
+        return pd.to_numeric(values).astype('float64')
+    if (values >= 0).all():
+        return pd.to_numeric(values, downcast='unsigned')
+    return pd.to_numeric(values, downcast='integer')
+
+
+def to_yes_no(values):
+    """Map Yes/No strings to booleans (nullable when anything else shows up)."""
+    flags = values.map({'Yes': True, 'No': False})
+    if flags.isna().any():
+        return flags.astype('boolean')
+    return flags.astype(bool)
+
+
+def _text(values):
+    if values.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(values):
+        return values.astype('category')
+    return values
+
+
+def memory_usage(df):
+    """Deep memory usage in bytes per column."""
+    return {column: int(size) for column, size in df.memory_usage(index=False, deep=True).items()}
+
+
+def apply_schema(df, measure_memory=True):
+    """Return ``(df, report)`` with :data:`SCHEMA` applied.
+
+    ``report`` holds the number of rejected ratings and, when
+    ``measure_memory`` is set, the per-column memory usage before and after
+    conversion (measuring deep memory usage is itself a full scan).
+    """
+    if measure_memory:
+        before = memory_usage(df)
+    df = df.copy()
+    rejected = 0
+    for column, kind in SCHEMA.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if kind == 'rating':
+            df[column], rejected = parse_rates(values)
+        elif kind == 'yes_no':
+            df[column] = to_yes_no(values)
+        elif kind == 'count':
+            df[column] = downcast_int(values)
+        elif kind == 'cost':
+            df[column] = downcast_int(parse_cost(values))
+        elif kind == 'category':
+            df[column] = values.astype('category')
+        else:
+            df[column] = _text(values)
+    report = {'rejected_rates': rejected}
+    if measure_memory:
+        report['memory_before'] = before
+        report['memory_after'] = memory_usage(df)
+    return df, report
+
+
+def _common_dtype(dtypes):
+    """The dtype ``pd.concat`` gives Series of ``dtypes``."""
+    dtypes = list(dict.fromkeys(dtypes))
+    if len(dtypes) == 1:
+        return dtypes[0]
+    return pd.concat([pd.Series([], dtype=dtype) for dtype in dtypes]).dtype
+
+
+class ChunkedSchema:
+    """The dtypes :func:`apply_schema` gives a whole frame, learned one cleaned chunk at a time.
+
+    :meth:`add` every chunk after :func:`apply_schema`, then :meth:`conform`
+    gives any of them the dtypes of the whole file: integer widths from the
+    overall range, float64 if any chunk had gaps, categories from the values
+    of every chunk (sorted, as ``astype('category')`` sorts them), nullable
+    booleans if any flag wasn't Yes/No, and text as categorical only if it
+    repeats enough across the file. Conformed chunks concatenate into exactly
+    what :func:`apply_schema` returns for the whole frame.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self._dtypes = {}
+        self._ranges = {}
+        self._values = {}
+        self._resolved = None
+
+    def add(self, chunk):
+        self.rows += len(chunk)
+        self._resolved = None
+        for column, values in chunk.items():
+            kind = SCHEMA.get(column)
+            self._dtypes.setdefault(column, {})[values.dtype] = None
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                self._add_values(column, values.cat.categories)
+            elif kind == 'text':
+                self._add_values(column, pd.Index(values.dropna().unique()))
+            elif kind in ('count', 'cost') and pd.api.types.is_integer_dtype(values.dtype) and len(values):
+                low, high = self._ranges.get(column, (values.min(), values.max()))
+                self._ranges[column] = (min(low, values.min()), max(high, values.max()))
+
+    def _add_values(self, column, values):
+        # Distinct values so far, then those of later chunks; merged whenever
+        # the later ones outgrow the first, so merging stays linear overall.
+        parts = self._values.setdefault(column, [])
+        parts.append(values)
+        if sum(map(len, parts[1:])) >= len(parts[0]):
+            self._values[column] = [self._distinct(column)]
+
+    def _distinct(self, column):
+        parts = self._values.get(column)
+        if not parts:
+            return pd.Index([])
+        return parts[0].append(parts[1:]).unique()
+
+    def _dtype(self, column):
+        kind, dtypes = SCHEMA.get(column), list(self._dtypes[column])
+        values = self._distinct(column)
+        if kind == 'category' or (kind == 'text' and len(values) <= CATEGORY_MAX_UNIQUE_RATIO * self.rows):
+            return pd.CategoricalDtype(values.sort_values())
+        if kind == 'text':
+            # A chunk that became categorical was read as its categories' dtype.
+            return _common_dtype(dtype.categories.dtype if isinstance(dtype, pd.CategoricalDtype) else dtype
+                                 for dtype in dtypes)
+        if column in self._ranges and all(pd.api.types.is_integer_dtype(dtype) for dtype in dtypes):
+            return downcast_int(pd.Series(self._ranges[column])).dtype
+        return _common_dtype(dtypes)
+
+    def dtypes(self):
+        """``{column: dtype}`` of the whole frame, in column order."""
+        if self._resolved is None:
+            self._resolved = {column: self._dtype(column) for column in self._dtypes}
+        return self._resolved
+
+    def conform(self, chunk):
+        """``chunk`` with the dtypes of the whole frame."""
+        chunk = chunk.copy()
+        for column, dtype in self.dtypes().items():
+            values = chunk[column]
+            if isinstance(dtype, pd.CategoricalDtype):
+                # The categories' hash table is built once and reused by every chunk.
+                codes = dtype.categories.get_indexer(values)
+                chunk[column] = pd.Categorical.from_codes(codes, dtype=dtype)
+            elif values.dtype != dtype:
+                chunk[column] = values.astype(dtype)
+        return chunk
+
+
+def memory_report(report):
+    """Per-column memory table (in KiB) built from an :func:`apply_schema` report."""
+    table = pd.DataFrame({
+        'Before (KiB)': pd.Series(report['memory_before']),
+        'After (KiB)': pd.Series(report['memory_after']),
+    }) / 1024
+    table.loc['Total'] = table.sum()
+    table['Saved %'] = (1 - table['After (KiB)'] / table['Before (KiB)']) * 100
+    return table.round(1)
@@ -0,0 +1,257 @@
+"""Precomputed dashboard snapshots, shared read-only by every session and process.
+
+A snapshot holds everything the unfiltered dashboard shows for one version
+of a dataset: the :class:`~zomato.aggregates.DashboardStats`, the row
+:class:`~zomato.aggregates.FrameSummary`, the chain table, the schema
+report, every figure as a PNG and as Plotly JSON. It is computed once (the
+warm-up) and written to a single file::
+
+    MAGIC | index length | JSON index {name: [offset, length]} | blobs...
+
+Readers memory-map the file read-only, so any number of sessions, Streamlit
+server processes and worker processes serve from the same pages of the OS
+page cache: figures are sliced out of the mapping without parsing, and the
+pickled statistics are unpickled once per process.
+
+Snapshots are named after the content hash of the source (see
+:func:`~zomato.cache.dataset_version`), so refreshing after the data changes
+means writing a new file; it is written to a temporary name and renamed into
+place, so readers see either no snapshot or a complete one. Older snapshots
+of the same source are then removed; processes still mapping one keep
+reading it until they move to the new version.
+
+Warm a snapshot before starting the servers with::
+
+    zomato-snapshot Zomato-data-.csv
+    zomato-snapshot Zomato-data-.csv --watch 60   # rebuild whenever the CSV changes
+"""
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import pickle
+import struct
+import time
+
+import plotly.io as pio
+
+from zomato.cache import CACHE_DIR, clean_chunks, dataset_version, load_clean, source_key
+from zomato.dedup import OUTLET_COLUMNS, chain_table
+from zomato.ingest import DATA_PATH, DEFAULT_CHUNKSIZE, StreamingAggregator
+from zomato.profiling import stage
+from zomato.render import build_interactive, chart_specs, render_serial
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+MAGIC = b'ZSNAP\x00\x01\x00'
+_HEADER = struct.Struct('<8sQ')
+# Bump whenever the pickled objects change shape so old snapshots are rebuilt.
+SNAPSHOT_FORMAT = 2
+
+
+def snapshot_path(source, version, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"{source_key(source)}-{version[:16]}.snap")
+
+
+def build_snapshot(source=DATA_PATH, snapshot_dir=SNAPSHOT_DIR, render=render_serial, chunksize=DEFAULT_CHUNKSIZE):
+    """Compute the dashboard for ``source`` and write its snapshot; return the snapshot's path.
+
+    ``render`` turns chart specs into ``{name: png}``, e.g.
+    :meth:`~zomato.render.FigureRenderer.render` to use a worker pool.
+    Statistics are folded in from the cleaned frame ``chunksize`` rows at a
+    time (see :func:`~zomato.cache.clean_chunks`).
+    """
+    with stage("load"):
+        while True:
+            # Label the snapshot with the version actually loaded, even if the
+            # file is replaced while it is being read.
+            version = dataset_version(source)
+            chunks, report = clean_chunks(source, chunksize=chunksize)
+            # Grouping names into chains looks at every row's name and outlet
+            # columns together; only those are read in full.
+            listings, _ = load_clean(source, columns=['name', *OUTLET_COLUMNS], chunksize=chunksize)
+            if dataset_version(source) == version:
+                break
+    with stage("resolve names"):
+        chains = chain_table(listings)
+        del listings
+    with stage("aggregate"):
+        # One record batch of the cleaned frame at a time, never the whole frame.
+        aggregator = StreamingAggregator()
+        for chunk in chunks:
+            aggregator.update_clean(chunk)
+        stats, summary = aggregator.stats(), aggregator.summary
+    specs = chart_specs(stats)
+    with stage("render figures"):
+        figures = render(specs)
+    with stage("build interactive"):
+        interactive = {spec.name: build_interactive(spec).to_json() for spec in specs}
+
+    blobs = {
+        'stats': pickle.dumps(stats, protocol=pickle.HIGHEST_PROTOCOL),
+        'summary': pickle.dumps(summary, protocol=pickle.HIGHEST_PROTOCOL),
+        'chains': pickle.dumps(chains, protocol=pickle.HIGHEST_PROTOCOL),
+        'schema_report': json.dumps(report).encode(),
+    }
+    blobs.update({f"figure/{name}": png for name, png in figures.items()})
+    blobs.update({f"plotly/{name}": text.encode() for name, text in interactive.items()})
+
+    # Offsets in the index are relative to the end of the index.
+    entries, offset = {}, 0
+    for name, blob in blobs.items():
+        entries[name] = [offset, len(blob)]
+        offset += len(blob)
+    index = json.dumps({
+        'format': SNAPSHOT_FORMAT,
+        'source': os.path.abspath(source),
+        'version': version,
+        'created': time.time(),
+        'entries': entries,
+    }).encode()
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = snapshot_path(source, version, snapshot_dir)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with stage("write snapshot"):
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, len(index)))
+                f.write(index)
+                for blob in blobs.values():
+                    f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    _remove_stale(source, path, snapshot_dir)
+    return path
+
+
+def _remove_stale(source, current, snapshot_dir):
+    stem = source_key(source)
+    for stale in glob.glob(os.path.join(glob.escape(snapshot_dir), f"{glob.escape(stem)}-*.snap")):
+        if os.path.basename(stale) != os.path.basename(current):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+class Snapshot:
+    """A read-only, memory-mapped snapshot file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a dashboard snapshot")
+        start = _HEADER.size
+        self.index = json.loads(bytes(self._map[start:start + index_length]))
+        self._data = memoryview(self._map)[start + index_length:]
+        self._objects = {}
+        self.path = path
+
+    @classmethod
+    def open(cls, source=DATA_PATH, version=None, snapshot_dir=SNAPSHOT_DIR):
+        """The snapshot of the current (or given) version of ``source``, or None if there is none yet."""
+        version = version or dataset_version(source)
+        try:
+            snapshot = cls(snapshot_path(source, version, snapshot_dir))
+        except (OSError, ValueError, struct.error):
+            return None
+        if snapshot.index.get('format') != SNAPSHOT_FORMAT or snapshot.version != version:
+            snapshot.close()
+            return None
+        return snapshot
+
+    @property
+    def version(self):
+        return self.index['version']
+
+    def blob(self, name):
+        """Zero-copy view of entry ``name``."""
+        offset, length = self.index['entries'][name]
+        return self._data[offset:offset + length]
+
+    def _load(self, name, decode):
+        if name not in self._objects:
+            self._objects[name] = decode(self.blob(name))
+        return self._objects[name]
+
+    @property
+    def stats(self):
+        return self._load('stats', pickle.loads)
+
+    @property
+    def summary(self):
+        return self._load('summary', pickle.loads)
+
+    @property
+    def chains(self):
+        return self._load('chains', pickle.loads)
+
+    @property
+    def schema_report(self):
+        return self._load('schema_report', lambda blob: json.loads(bytes(blob)))
+
+    def figure(self, name):
+        """PNG bytes of figure ``name``."""
+        return bytes(self.blob(f"figure/{name}"))
+
+    def interactive(self, name):
+        """Plotly figure ``name``."""
+        return self._load(f"plotly/{name}", lambda blob: pio.from_json(bytes(blob).decode()))
+
+    def close(self):
+        if getattr(self, '_data', None) is not None:
+            self._data.release()
+            self._data = None
+        self._map.close()
+
+
+def warm_snapshot(source=DATA_PATH, version=None, snapshot_dir=SNAPSHOT_DIR, render=render_serial):
+    """Open the snapshot of ``source``, building it first if the current version has none.
+
+    If the CSV changes during the build, the snapshot just built (of the
+    version that was loaded) is returned; the next call picks up the change.
+    """
+    while True:
+        snapshot = Snapshot.open(source, version, snapshot_dir)
+        if snapshot is not None:
+            return snapshot
+        try:
+            return Snapshot(build_snapshot(source, snapshot_dir, render))
+        except FileNotFoundError:
+            # A concurrent build of a newer version removed it before it was mapped.
+            version = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute dashboard snapshots for the given CSV files.")
+    parser.add_argument('sources', nargs='*', default=[DATA_PATH])
+    parser.add_argument('--dir', default=SNAPSHOT_DIR, help=f"snapshot directory (default: {SNAPSHOT_DIR})")
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="keep running and rebuild a snapshot whenever its CSV changes")
+    args = parser.parse_args(argv)
+
+    while True:
+        for source in args.sources:
+            snapshot = Snapshot.open(source, snapshot_dir=args.dir)
+            if snapshot is None:
+                start = time.perf_counter()
+                path = build_snapshot(source, args.dir)
+                print(f"{source}: wrote {path} in {time.perf_counter() - start:.1f}s", flush=True)
+            else:
+                snapshot.close()
+        if args.watch is None:
+            return
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    main()